@@ -26,13 +26,20 @@ def main():
     print("  - Sauvegarde en multiple formats")
     print("=" * 80)
     
+    # --resume : reprendre un traitement interrompu (chunks du manifeste ignorés)
+    resume = '--resume' in sys.argv
+    if resume:
+        print("⏩ Reprise du traitement précédent (manifeste des chunks)")
+    
     start_time = time.time()
     
     # Configuration du pipeline pour traitement complet
     pipeline = MassivePreprocessingPipeline(
         output_dir="data/processed_full",
         use_multiprocessing=True,
-        chunk_size=5000  # Chunks optimisés pour 4M d'échantillons
+        chunk_size=5000,  # Chunks optimisés pour 4M d'échantillons
+        chunking='adaptive',  # Chunks de coût égal (longueur des avis variable)
+        storage_profile='compact'  # Colonnes dérivables reconstruites à la lecture
     )
     
     try:
@@ -42,7 +49,7 @@ def main():
         print("-" * 80)
         
         # Lancer le pipeline complet
-        train_df, test_df = pipeline.run_full_pipeline()
+        train_df, test_df = pipeline.run_full_pipeline(resume=resume)
         
         total_time = time.time() - start_time
         
@@ -74,7 +81,7 @@ def main():
         
     except KeyboardInterrupt:
         print("\n⚠️  TRAITEMENT INTERROMPU PAR L'UTILISATEUR")
-        print("💡 Le traitement peut être repris plus tard")
+        print("💡 Le traitement peut être repris plus tard: python run_full_preprocessing.py --resume")
         return False
         
     except Exception as e:
@@ -0,0 +1,272 @@
+"""
+Détection de labels bruités par apprentissage confiant (confident learning)
+Second détecteur, complémentaire des règles lexicales du LabelCleaner
+"""
+
+import time
+import logging
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from label_cleaner import LabelCleaner, chunk_to_frame
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ConfidentLearningDetector:
+    """
+    Détecte les labels suspects à partir des probabilités hors échantillon
+    d'un modèle linéaire rapide
+
+    Chaque échantillon est affecté à l'un des n_folds plis ; le modèle du pli
+    k (features hachées + SGD logistique, entraîné par partial_fit chunk par
+    chunk) n'apprend que sur les autres plis, puis prédit les échantillons du
+    pli k. Comme en confident learning, le seuil de la classe j est la
+    probabilité moyenne de j sur les échantillons labellisés j : un
+    échantillon est suspect si la probabilité de son label est sous le seuil
+    de ce label alors qu'une autre classe dépasse le sien.
+
+    Le résultat a le schéma de LabelCleaner.detect_mislabeled (sentiment et
+    mots-clés ne sont calculés que pour les suspects), plus les colonnes
+    model_probability et model_prediction : suggest_corrections s'applique
+    tel quel.
+    """
+
+    def __init__(self, cleaner: Optional[LabelCleaner] = None,
+                 n_folds: int = 4,
+                 n_epochs: int = 1,
+                 n_features: int = 2 ** 20,
+                 alpha: float = 1e-6,
+                 batch_size: int = 50000,
+                 classes: Iterable[int] = (0, 1),
+                 random_state: int = 42):
+        """
+        Initialise le détecteur
+
+        Args:
+            cleaner: LabelCleaner pour décrire les suspects (sentiment, mots-clés)
+            n_folds: Nombre de plis hors échantillon
+            n_epochs: Nombre de passes d'entraînement sur les données
+            n_features: Nombre de features hachées (unigrammes et bigrammes)
+            alpha: Régularisation L2 du SGD
+            batch_size: Taille des chunks quand les données sont un DataFrame
+            classes: Labels possibles (dans n'importe quel ordre : ils sont
+                     triés, comme les colonnes de predict_proba)
+            random_state: Graine (plis et modèles)
+        """
+        self.cleaner = cleaner if cleaner is not None else LabelCleaner()
+        self.n_folds = n_folds
+        self.n_epochs = n_epochs
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.classes = np.unique(list(classes))
+        self.random_state = random_state
+
+        # Sans état : aucun vocabulaire à construire ni à stocker
+        self.vectorizer = HashingVectorizer(n_features=n_features, ngram_range=(1, 2),
+                                            alternate_sign=False, norm='l2')
+        self.models = []
+        self.class_thresholds = None
+
+    def _iter_chunks(self, data: Union[pd.DataFrame, Callable[[], Iterable]],
+                     text_column: str) -> Iterator[pd.DataFrame]:
+        """Chunks des données, toujours dans le même ordre"""
+        if isinstance(data, pd.DataFrame):
+            for start in range(0, len(data), self.batch_size):
+                yield chunk_to_frame(data.iloc[start:start + self.batch_size], text_column)
+        else:
+            offset = 0
+            for chunk in data():
+                chunk_df = chunk_to_frame(chunk, text_column, offset=offset)
+                offset += len(chunk_df)
+                yield chunk_df
+
+    def _vectorize(self, chunk_df: pd.DataFrame, text_column: str):
+        """Matrice creuse des features hachées d'un chunk"""
+        texts = [text if isinstance(text, str) else "" for text in chunk_df[text_column]]
+        return self.vectorizer.transform(texts)
+
+    def fit(self, data: Union[pd.DataFrame, Callable[[], Iterable]],
+            text_column: str = 'combined_text',
+            label_column: str = 'label') -> 'ConfidentLearningDetector':
+        """
+        Entraîne un modèle par pli, en streaming sur les chunks
+
+        Args:
+            data: DataFrame, ou fonction renvoyant un nouvel itérateur de chunks
+                  (ex. lambda: dataset['train'].iter(batch_size=50000))
+            text_column: Nom de la colonne de texte
+            label_column: Nom de la colonne de labels
+
+        Returns:
+            Le détecteur entraîné
+        """
+        self.models = [SGDClassifier(loss='log_loss', alpha=self.alpha,
+                                     random_state=self.random_state + fold)
+                       for fold in range(self.n_folds)]
+
+        for epoch in range(self.n_epochs):
+            fold_rng = np.random.default_rng(self.random_state)
+            for chunk_df in self._iter_chunks(data, text_column):
+                X = self._vectorize(chunk_df, text_column)
+                y = chunk_df[label_column].to_numpy()
+                folds = fold_rng.integers(0, self.n_folds, size=len(chunk_df))
+                for fold, model in enumerate(self.models):
+                    train = folds != fold
+                    if train.any():
+                        model.partial_fit(X[train], y[train], classes=self.classes)
+            logger.info(f"  - Époque {epoch + 1}/{self.n_epochs} terminée")
+
+        return self
+
+    def out_of_fold_probabilities(self, data: Union[pd.DataFrame, Callable[[], Iterable]],
+                                  text_column: str = 'combined_text',
+                                  label_column: str = 'label') -> Dict[str, np.ndarray]:
+        """
+        Probabilités de chaque classe, prédites par le modèle du pli de l'échantillon
+
+        Args:
+            data: Mêmes données (et même ordre) que pour fit
+            text_column: Nom de la colonne de texte
+            label_column: Nom de la colonne de labels
+
+        Returns:
+            Dictionnaire {'index', 'labels', 'probabilities' (n x classes, float32)}
+        """
+        index_parts, label_parts, probability_parts = [], [], []
+        fold_rng = np.random.default_rng(self.random_state)
+
+        for chunk_df in self._iter_chunks(data, text_column):
+            X = self._vectorize(chunk_df, text_column)
+            folds = fold_rng.integers(0, self.n_folds, size=len(chunk_df))
+            probabilities = np.empty((len(chunk_df), len(self.classes)), dtype=np.float32)
+            for fold, model in enumerate(self.models):
+                rows = np.flatnonzero(folds == fold)
+                if len(rows):
+                    probabilities[rows] = model.predict_proba(X[rows])
+            index_parts.append(chunk_df.index.to_numpy())
+            label_parts.append(chunk_df[label_column].to_numpy())
+            probability_parts.append(probabilities)
+
+        return {
+            'index': np.concatenate(index_parts),
+            'labels': np.concatenate(label_parts),
+            'probabilities': np.concatenate(probability_parts)
+        }
+
+    def detect_mislabeled(self, data: Union[pd.DataFrame, Callable[[], Iterable]],
+                          text_column: str = 'combined_text',
+                          label_column: str = 'label') -> pd.DataFrame:
+        """
+        Détecte les échantillons potentiellement mal labellisés
+
+        Args:
+            data: DataFrame, ou fonction renvoyant un nouvel itérateur de chunks
+                  (les données sont parcourues trois fois : entraînement,
+                  prédiction, description des suspects)
+            text_column: Nom de la colonne de texte
+            label_column: Nom de la colonne de labels
+
+        Returns:
+            DataFrame des suspects au schéma de detect_mislabeled, trié par
+            confiance décroissante (1 - probabilité du label)
+        """
+        logger.info(f"🔄 Confident learning ({self.n_folds} plis)...")
+        start_time = time.time()
+
+        self.fit(data, text_column, label_column)
+        oof = self.out_of_fold_probabilities(data, text_column, label_column)
+
+        labels = oof['labels']
+        probabilities = oof['probabilities']
+        label_positions = np.searchsorted(self.classes, labels)
+        given_probability = probabilities[np.arange(len(labels)), label_positions]
+
+        # Seuil par classe : probabilité moyenne de la classe sur ses propres échantillons
+        self.class_thresholds = np.array([
+            given_probability[label_positions == position].mean() if (label_positions == position).any() else 1.0
+            for position in range(len(self.classes))
+        ])
+
+        # Suspect : label sous son seuil, et une autre classe au-dessus du sien
+        above_threshold = probabilities >= self.class_thresholds
+        above_threshold[np.arange(len(labels)), label_positions] = False
+        is_suspect = (given_probability < self.class_thresholds[label_positions]) & above_threshold.any(axis=1)
+        positions = np.flatnonzero(is_suspect)
+
+        logger.info(f"  - Seuils par classe: {np.round(self.class_thresholds, 3).tolist()}")
+
+        conflicts_df = self._describe_suspects(data, text_column, positions, oof, given_probability)
+
+        processing_time = time.time() - start_time
+        if len(conflicts_df) > 0:
+            conflicts_df = conflicts_df.sort_values('confidence_score', ascending=False)
+            logger.info(f"🚨 {len(conflicts_df)} échantillons suspects détectés "
+                        f"({len(conflicts_df)/len(labels)*100:.1f}%) en {processing_time:.1f}s")
+        else:
+            logger.info(f"✅ Aucun conflit détecté ({processing_time:.1f}s)")
+
+        return conflicts_df
+
+    def _describe_suspects(self, data: Union[pd.DataFrame, Callable[[], Iterable]],
+                           text_column: str, positions: np.ndarray,
+                           oof: Dict[str, np.ndarray],
+                           given_probability: np.ndarray) -> pd.DataFrame:
+        """
+        DataFrame des suspects (positions dans les données) au schéma de detect_mislabeled
+
+        Args:
+            data: Données de detect_mislabeled
+            text_column: Nom de la colonne de texte
+            positions: Positions des suspects, croissantes
+            oof: Résultat de out_of_fold_probabilities
+            given_probability: Probabilité hors échantillon du label de chaque ligne
+
+        Returns:
+            DataFrame des suspects, dans l'ordre des données
+        """
+        if len(positions) == 0:
+            return pd.DataFrame()
+
+        # Textes des suspects (nouveau parcours des données)
+        texts: List[str] = []
+        offset = 0
+        for chunk_df in self._iter_chunks(data, text_column):
+            chunk_end = offset + len(chunk_df)
+            lo, hi = np.searchsorted(positions, [offset, chunk_end])
+            if hi > lo:
+                texts.extend(chunk_df[text_column].iloc[positions[lo:hi] - offset])
+            offset = chunk_end
+        texts = [text if isinstance(text, str) else "" for text in texts]
+
+        sentiments = [self.cleaner.analyze_sentiment_textblob(text) for text in texts]
+        keywords = [self.cleaner.analyze_keywords(text) for text in texts]
+
+        labels = oof['labels'][positions]
+        probability = given_probability[positions]
+        threshold = self.class_thresholds[np.searchsorted(self.classes, labels)]
+        texts = pd.Series(texts, dtype=object)
+
+        conflict_reason = ("Modèle : probabilité du label " + pd.Series(probability).map('{:.3f}'.format)
+                           + " < seuil " + pd.Series(threshold).map('{:.3f}'.format))
+
+        return pd.DataFrame({
+            'index': oof['index'][positions],
+            'actual_label': labels,
+            'text': texts.str.slice(0, 200).mask(texts.str.len() > 200, texts.str.slice(0, 200) + "..."),
+            'polarity': [sentiment['polarity'] for sentiment in sentiments],
+            'subjectivity': [sentiment['subjectivity'] for sentiment in sentiments],
+            'textblob_prediction': [sentiment['predicted_label'] for sentiment in sentiments],
+            'keyword_prediction': [analysis['predicted_label'] for analysis in keywords],
+            'negative_keywords': [analysis['negative_keywords'] for analysis in keywords],
+            'positive_keywords': [analysis['positive_keywords'] for analysis in keywords],
+            'conflict_reason': conflict_reason,
+            'confidence_score': 1.0 - probability.astype(float),
+            'model_probability': probability,
+            'model_prediction': self.classes[oof['probabilities'][positions].argmax(axis=1)]
+        })
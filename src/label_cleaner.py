@@ -4,22 +4,152 @@ Module pour détecter et corriger les labels incorrects dans le dataset Amazon P
 
 import pandas as pd
 import numpy as np
-from textblob import TextBlob
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterable, Union, FrozenSet
+import re
+import heapq
 import logging
 
-from text_preprocessor import AdvancedTextPreprocessor
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick absent : recherche mot-clé par mot-clé
+    ahocorasick = None
+
+from text_preprocessor import AdvancedTextPreprocessor, get_shared_preprocessor, SENTIMENT_BACKENDS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def chunk_to_frame(chunk, text_column: str = 'combined_text', offset: int = 0) -> pd.DataFrame:
+    """
+    DataFrame d'un chunk de données
+
+    Args:
+        chunk: DataFrame, lot {colonne: valeurs} (Dataset.iter) ou liste d'échantillons
+        text_column: Colonne de texte, construite comme title + " " + content si absente
+        offset: Position du chunk dans le split (index des chunks hors DataFrame)
+
+    Returns:
+        DataFrame du chunk
+    """
+    if not isinstance(chunk, pd.DataFrame):
+        chunk = pd.DataFrame(chunk)
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+    if text_column not in chunk and 'title' in chunk and 'content' in chunk:
+        chunk = chunk.assign(**{text_column: chunk['title'] + " " + chunk['content']})
+    return chunk
+
+
+class KeywordMatcher:
+    """
+    Recherche simultanée de mots-clés (et d'expressions) dans un texte
+
+    Les mots-clés sont compilés une seule fois dans un automate
+    d'Aho-Corasick (pyahocorasick) : toutes les occurrences sont trouvées
+    en un seul parcours du texte, quel que soit le nombre de mots-clés.
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = False):
+        """
+        Construit le matcher
+
+        Args:
+            keywords: Mots-clés ou expressions ("stopped working"), insensibles à la casse
+            word_boundaries: N'accepter que des mots entiers ("bad" ne
+                             correspond plus à "badge" ni "poor" à "poorly")
+        """
+        self.keywords = frozenset(keyword.lower() for keyword in keywords)
+        self.word_boundaries = word_boundaries
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            if self.keywords:
+                self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            template = r'(?<!\w){}(?!\w)' if word_boundaries else '{}'
+            self._patterns = {keyword: re.compile(template.format(re.escape(keyword)))
+                              for keyword in self.keywords}
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Compte les occurrences de chaque mot-clé
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Dictionnaire mot-clé -> nombre d'occurrences (mots-clés trouvés uniquement)
+        """
+        text = text.lower()
+        hits = {}
+
+        if self._automaton is None:
+            for keyword, pattern in self._patterns.items():
+                n_hits = len(pattern.findall(text))
+                if n_hits:
+                    hits[keyword] = n_hits
+            return hits
+
+        if not self.keywords:
+            return hits
+
+        if not self.word_boundaries:
+            for _, keyword in self._automaton.iter(text):
+                hits[keyword] = hits.get(keyword, 0) + 1
+            return hits
+
+        text_length = len(text)
+        for end, keyword in self._automaton.iter(text):
+            start = end - len(keyword) + 1
+            if start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+                continue
+            if end + 1 < text_length and (text[end + 1].isalnum() or text[end + 1] == '_'):
+                continue
+            hits[keyword] = hits.get(keyword, 0) + 1
+        return hits
+
+
 class LabelCleaner:
     """
     Classe pour détecter et corriger les labels incorrects
     """
     
-    def __init__(self):
-        self.preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    def __init__(self, preprocessor: Optional[AdvancedTextPreprocessor] = None,
+                 sentiment_backend: Optional[str] = None,
+                 keyword_word_boundaries: bool = False):
+        """
+        Initialise le nettoyeur
+
+        Args:
+            preprocessor: Preprocesseur à réutiliser (sinon, le preprocesseur
+                          partagé du processus est obtenu à la première utilisation)
+            sentiment_backend: 'textblob' ou 'fast' (None = celui du
+                               preprocesseur injecté, sinon 'textblob')
+            keyword_word_boundaries: Ne compter que les mots-clés apparaissant
+                                     comme mots entiers (sinon sous-chaînes)
+        """
+        if preprocessor is not None:
+            if sentiment_backend is not None and sentiment_backend != preprocessor.sentiment_backend:
+                raise ValueError(f"sentiment_backend {sentiment_backend!r} différent de celui "
+                                 f"du preprocesseur ({preprocessor.sentiment_backend!r})")
+            sentiment_backend = preprocessor.sentiment_backend
+        elif sentiment_backend is None:
+            sentiment_backend = 'textblob'
+        elif sentiment_backend not in SENTIMENT_BACKENDS:
+            raise ValueError(f"sentiment_backend inconnu : {sentiment_backend!r} "
+                             f"(attendu : {', '.join(SENTIMENT_BACKENDS)})")
+        
+        self._preprocessor = preprocessor
+        self.sentiment_backend = sentiment_backend
+        
+        # Matcher construit à la demande pour les mots-clés courants (voir
+        # keyword_matcher), invalidé par les setters des mots-clés
+        self._keyword_matcher = None
+        self._negative_set = frozenset()
+        self._positive_set = frozenset()
+        self.keyword_word_boundaries = keyword_word_boundaries
         
         # Mots-clés négatifs forts
         self.negative_keywords = {
@@ -36,111 +166,137 @@ class LabelCleaner:
             'recommend', 'best', 'impressed', 'satisfied', 'happy'
         }
     
+    @property
+    def preprocessor(self) -> AdvancedTextPreprocessor:
+        """Preprocesseur injecté, ou preprocesseur partagé construit à la demande"""
+        if self._preprocessor is None:
+            self._preprocessor = get_shared_preprocessor(use_spacy=False,
+                                                         sentiment_backend=self.sentiment_backend)
+        return self._preprocessor
+    
     def analyze_sentiment_textblob(self, text: str) -> Dict:
         """
-        Analyse le sentiment avec TextBlob
-        """
-        try:
-            blob = TextBlob(text)
-            return {
-                'polarity': blob.sentiment.polarity,
-                'subjectivity': blob.sentiment.subjectivity,
-                'predicted_label': 1 if blob.sentiment.polarity > 0 else 0
-            }
-        except:
-            return {
-                'polarity': 0,
-                'subjectivity': 0,
-                'predicted_label': 0
-            }
+        Analyse le sentiment avec TextBlob, ou son équivalent rapide selon
+        sentiment_backend (via le preprocesseur, qui compte les analyses)
+        """
+        return self.preprocessor.analyze_sentiment(text)
+    
+    @property
+    def negative_keywords(self) -> FrozenSet[str]:
+        """Mots-clés négatifs forts (ensemble figé : le réaffecter pour le modifier)"""
+        return self._negative_keywords
+    
+    @negative_keywords.setter
+    def negative_keywords(self, keywords: Iterable[str]):
+        self._negative_keywords = frozenset(keywords)
+        self._keyword_matcher = None
+    
+    @property
+    def positive_keywords(self) -> FrozenSet[str]:
+        """Mots-clés positifs forts (ensemble figé : le réaffecter pour le modifier)"""
+        return self._positive_keywords
+    
+    @positive_keywords.setter
+    def positive_keywords(self, keywords: Iterable[str]):
+        self._positive_keywords = frozenset(keywords)
+        self._keyword_matcher = None
+    
+    @property
+    def keyword_word_boundaries(self) -> bool:
+        """Ne compter que les mots-clés apparaissant comme mots entiers"""
+        return self._keyword_word_boundaries
+    
+    @keyword_word_boundaries.setter
+    def keyword_word_boundaries(self, word_boundaries: bool):
+        self._keyword_word_boundaries = word_boundaries
+        self._keyword_matcher = None
+    
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """
+        Matcher des mots-clés négatifs et positifs (un seul parcours du
+        texte), construit à la première utilisation
+
+        Les mots-clés sont des ensembles figés : leurs setters (et celui de
+        keyword_word_boundaries) invalident le matcher, qui est alors
+        reconstruit ici. Aucune vérification n'est faite à chaque appel.
+        """
+        if self._keyword_matcher is None:
+            self._keyword_matcher = KeywordMatcher(
+                self._negative_keywords | self._positive_keywords,
+                word_boundaries=self._keyword_word_boundaries
+            )
+            self._negative_set = frozenset(word.lower() for word in self._negative_keywords)
+            self._positive_set = frozenset(word.lower() for word in self._positive_keywords)
+        return self._keyword_matcher
+    
+    def reset_keyword_matcher(self):
+        """Force la reconstruction du matcher à la prochaine utilisation"""
+        self._keyword_matcher = None
     
-    def analyze_keywords(self, text: str) -> Dict:
+    def analyze_keywords(self, text: str, return_hits: bool = False) -> Dict:
         """
         Analyse basée sur les mots-clés
+        
+        Args:
+            text: Texte à analyser
+            return_hits: Ajouter le détail des occurrences par mot-clé
+            
+        Returns:
+            Nombre de mots-clés négatifs / positifs distincts trouvés, score
+            et prédiction (+ 'negative_hits' / 'positive_hits' si return_hits)
         """
-        text_lower = text.lower()
+        hits = self.keyword_matcher.count(text)
         
-        neg_count = sum(1 for word in self.negative_keywords if word in text_lower)
-        pos_count = sum(1 for word in self.positive_keywords if word in text_lower)
+        neg_count = sum(1 for word in hits if word in self._negative_set)
+        pos_count = sum(1 for word in hits if word in self._positive_set)
         
         # Score basé sur les mots-clés
         keyword_score = pos_count - neg_count
         
-        return {
+        analysis = {
             'negative_keywords': neg_count,
             'positive_keywords': pos_count,
             'keyword_score': keyword_score,
             'predicted_label': 1 if keyword_score > 0 else 0
         }
+        if return_hits:
+            analysis['negative_hits'] = {word: n for word, n in hits.items() if word in self._negative_set}
+            analysis['positive_hits'] = {word: n for word, n in hits.items() if word in self._positive_set}
+        return analysis
     
     def detect_mislabeled(self, df: pd.DataFrame, 
                          text_column: str = 'combined_text',
                          label_column: str = 'label',
-                         threshold: float = 0.3) -> pd.DataFrame:
+                         threshold: float = 0.3,
+                         batch_size: int = 100000) -> pd.DataFrame:
         """
         Détecte les échantillons potentiellement mal labellisés
         
+        Le DataFrame est traité par lots de batch_size lignes (mémoire bornée) :
+        polarités et comptes de mots-clés sont calculés en colonnes, les règles
+        appliquées par masques booléens et seuls les conflits sont conservés.
+        
         Args:
             df: DataFrame à analyser
             text_column: Nom de la colonne de texte
             label_column: Nom de la colonne de labels
             threshold: Seuil de polarité pour considérer un conflit
+            batch_size: Nombre de lignes analysées à la fois
             
         Returns:
             DataFrame avec les échantillons suspects
         """
         logger.info(f"Analyse de {len(df)} échantillons pour détecter les erreurs de labels...")
         
-        results = []
+        batches = []
+        for start in range(0, len(df), batch_size):
+            batch = df.iloc[start:start + batch_size]
+            batch_conflicts = self.detect_conflicts(batch[text_column], batch[label_column], threshold)
+            if len(batch_conflicts) > 0:
+                batches.append(batch_conflicts)
         
-        for idx, row in df.iterrows():
-            text = row[text_column]
-            actual_label = row[label_column]
-            
-            # Analyse TextBlob
-            textblob_analysis = self.analyze_sentiment_textblob(text)
-            
-            # Analyse par mots-clés
-            keyword_analysis = self.analyze_keywords(text)
-            
-            # Détection de conflit
-            polarity = textblob_analysis['polarity']
-            
-            # Conflit si :
-            # - Label positif (1) mais polarité très négative (< -threshold)
-            # - Label négatif (0) mais polarité très positive (> threshold)
-            is_conflict = False
-            conflict_reason = ""
-            
-            if actual_label == 1 and polarity < -threshold:
-                is_conflict = True
-                conflict_reason = f"Label positif mais polarité négative ({polarity:.3f})"
-            elif actual_label == 0 and polarity > threshold:
-                is_conflict = True
-                conflict_reason = f"Label négatif mais polarité positive ({polarity:.3f})"
-            
-            # Conflit basé sur les mots-clés
-            if actual_label == 1 and keyword_analysis['negative_keywords'] > keyword_analysis['positive_keywords']:
-                if keyword_analysis['negative_keywords'] >= 2:  # Au moins 2 mots négatifs forts
-                    is_conflict = True
-                    conflict_reason += f" + {keyword_analysis['negative_keywords']} mots négatifs forts"
-            
-            if is_conflict:
-                results.append({
-                    'index': idx,
-                    'actual_label': actual_label,
-                    'text': text[:200] + "..." if len(text) > 200 else text,
-                    'polarity': polarity,
-                    'subjectivity': textblob_analysis['subjectivity'],
-                    'textblob_prediction': textblob_analysis['predicted_label'],
-                    'keyword_prediction': keyword_analysis['predicted_label'],
-                    'negative_keywords': keyword_analysis['negative_keywords'],
-                    'positive_keywords': keyword_analysis['positive_keywords'],
-                    'conflict_reason': conflict_reason,
-                    'confidence_score': abs(polarity)  # Plus la polarité est forte, plus on est confiant
-                })
-        
-        conflicts_df = pd.DataFrame(results)
+        conflicts_df = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
         
         if len(conflicts_df) > 0:
             # Trier par score de confiance décroissant
@@ -152,22 +308,151 @@ class LabelCleaner:
         
         return conflicts_df
     
+    def detect_conflicts(self, texts: pd.Series, labels: pd.Series,
+                         threshold: float = 0.3) -> pd.DataFrame:
+        """
+        Détecte les conflits d'un lot de textes et de labels
+        
+        Brique commune de detect_mislabeled (par lots) et de
+        StreamingSuspectRanker (par chunks) : les conflits sont renvoyés dans
+        l'ordre des lignes, sans tri ni log, avec l'index d'origine de texts.
+        
+        Args:
+            texts: Textes du lot
+            labels: Labels du lot
+            threshold: Seuil de polarité pour considérer un conflit
+            
+        Returns:
+            DataFrame des conflits (vide si aucun)
+        """
+        text_values = texts.to_numpy()
+        label_values = labels.to_numpy()
+        
+        # Sentiment (moteur du LabelCleaner : TextBlob ou rapide)
+        polarity = np.empty(len(text_values), dtype=float)
+        subjectivity = np.empty(len(text_values), dtype=float)
+        for position, text in enumerate(text_values):
+            sentiment = self.analyze_sentiment_textblob(text)
+            polarity[position] = sentiment['polarity']
+            subjectivity[position] = sentiment['subjectivity']
+        
+        # Conflit si :
+        # - Label positif (1) mais polarité très négative (< -threshold)
+        # - Label négatif (0) mais polarité très positive (> threshold)
+        is_positive = label_values == 1
+        positive_conflict = is_positive & (polarity < -threshold)
+        negative_conflict = (label_values == 0) & (polarity > threshold)
+        
+        # Mots-clés : utiles pour la règle (labels positifs) et pour décrire
+        # les conflits de polarité ; inutiles pour les autres lignes
+        negative_counts = np.zeros(len(text_values), dtype=np.int64)
+        positive_counts = np.zeros(len(text_values), dtype=np.int64)
+        for position in np.flatnonzero(is_positive | negative_conflict):
+            keyword_analysis = self.analyze_keywords(text_values[position])
+            negative_counts[position] = keyword_analysis['negative_keywords']
+            positive_counts[position] = keyword_analysis['positive_keywords']
+        
+        # Conflit basé sur les mots-clés (au moins 2 mots négatifs forts)
+        keyword_conflict = is_positive & (negative_counts > positive_counts) & (negative_counts >= 2)
+        
+        positions = np.flatnonzero(positive_conflict | negative_conflict | keyword_conflict)
+        if len(positions) == 0:
+            return pd.DataFrame()
+        
+        conflict_texts = pd.Series(text_values[positions], dtype=object)
+        conflict_polarity = polarity[positions]
+        negative_keywords = negative_counts[positions]
+        positive_keywords = positive_counts[positions]
+        
+        # Raison du conflit
+        polarity_labels = pd.Series(conflict_polarity).map('{:.3f}'.format)
+        conflict_reason = pd.Series("", index=polarity_labels.index)
+        conflict_reason = conflict_reason.mask(
+            positive_conflict[positions], "Label positif mais polarité négative (" + polarity_labels + ")")
+        conflict_reason = conflict_reason.mask(
+            negative_conflict[positions], "Label négatif mais polarité positive (" + polarity_labels + ")")
+        conflict_reason = conflict_reason.mask(
+            keyword_conflict[positions],
+            conflict_reason + " + " + pd.Series(negative_keywords).astype(str) + " mots négatifs forts")
+        
+        return pd.DataFrame({
+            'index': texts.index[positions],
+            'actual_label': label_values[positions],
+            'text': conflict_texts.str.slice(0, 200).mask(
+                conflict_texts.str.len() > 200, conflict_texts.str.slice(0, 200) + "..."),
+            'polarity': conflict_polarity,
+            'subjectivity': subjectivity[positions],
+            'textblob_prediction': (conflict_polarity > 0).astype(np.int64),
+            'keyword_prediction': (positive_keywords > negative_keywords).astype(np.int64),
+            'negative_keywords': negative_keywords,
+            'positive_keywords': positive_keywords,
+            'conflict_reason': conflict_reason,
+            'confidence_score': np.abs(conflict_polarity)  # Plus la polarité est forte, plus on est confiant
+        })
+    
+    def detect_mislabeled_streaming(self, chunks: Iterable,
+                                    split: str = 'train',
+                                    top_n: int = 1000,
+                                    threshold: float = 0.3,
+                                    text_column: str = 'combined_text',
+                                    label_column: str = 'label',
+                                    ranker: Optional['StreamingSuspectRanker'] = None) -> 'StreamingSuspectRanker':
+        """
+        Version streaming de detect_mislabeled : seuls les top_n conflits les
+        plus confiants sont conservés (mémoire en O(top_n))
+        
+        Args:
+            chunks: Itérateur de chunks (DataFrames, lots {colonne: valeurs}
+                    comme Dataset.iter(batch_size=...), ou listes d'échantillons)
+            split: Nom du split (compteurs par split)
+            top_n: Nombre de suspects conservés
+            threshold: Seuil de polarité pour considérer un conflit
+            text_column: Nom de la colonne de texte (sinon title + " " + content)
+            label_column: Nom de la colonne de labels
+            ranker: Classement à compléter (plusieurs splits), sinon nouveau
+            
+        Returns:
+            StreamingSuspectRanker (top_conflicts() pour le DataFrame des suspects)
+        """
+        if ranker is None:
+            ranker = StreamingSuspectRanker(self, top_n=top_n, threshold=threshold,
+                                            text_column=text_column, label_column=label_column)
+        
+        logger.info(f"🔄 Classement streaming des suspects du split '{split}' (top {ranker.top_n:,})...")
+        for chunk in chunks:
+            ranker.update(chunk, split=split)
+        
+        counters = ranker.counters[split]
+        logger.info(f"🚨 {counters['conflicts']:,} conflits sur {counters['samples']:,} échantillons "
+                    f"({len(ranker):,} conservés)")
+        return ranker
+    
     def suggest_corrections(self, conflicts_df: pd.DataFrame, top_n: int = 20) -> List[Dict]:
         """
         Suggère des corrections pour les labels les plus suspects
+        
+        Pour les conflits détectés par un modèle (colonne 'model_prediction',
+        ex. ConfidentLearningDetector), le label suggéré est la prédiction du
+        modèle ; la confiance dépend de l'accord de TextBlob et des mots-clés.
         """
         if len(conflicts_df) == 0:
             return []
         
         suggestions = []
+        has_model_prediction = 'model_prediction' in conflicts_df.columns
         
         for _, row in conflicts_df.head(top_n).iterrows():
             # Suggestion basée sur TextBlob et mots-clés
             textblob_pred = row['textblob_prediction']
             keyword_pred = row['keyword_prediction']
             
+            if has_model_prediction:
+                # Suggestion du modèle, confirmée ou non par les deux règles
+                suggested_label = row['model_prediction']
+                n_agreeing = int(textblob_pred == suggested_label) + int(keyword_pred == suggested_label)
+                confidence = ("Faible", "Moyenne", "Haute")[n_agreeing]
             # Si les deux méthodes sont d'accord et différentes du label actuel
-            if textblob_pred == keyword_pred and textblob_pred != row['actual_label']:
+            elif textblob_pred == keyword_pred and textblob_pred != row['actual_label']:
                 confidence = "Haute"
                 suggested_label = textblob_pred
             elif abs(row['polarity']) > 0.5:  # Polarité très forte
@@ -188,20 +473,227 @@ class LabelCleaner:
         
         return suggestions
     
-    def apply_corrections(self, df: pd.DataFrame, corrections: List[Dict]) -> pd.DataFrame:
+    def apply_corrections(self, df: pd.DataFrame,
+                          corrections: Union[List[Dict], pd.DataFrame, pd.Series],
+                          inplace: bool = False,
+                          label_column: str = 'label') -> pd.DataFrame:
         """
         Applique les corrections suggérées
+        
+        Toutes les corrections sont appliquées en une seule affectation
+        alignée sur l'index (la dernière l'emporte si un index est répété ;
+        les index absents de df sont ignorés). Sans inplace, seule la colonne
+        de labels est copiée : les autres colonnes sont partagées avec df.
+        Le journal des corrections s'obtient avec correction_audit.
+        
+        Args:
+            df: DataFrame à corriger
+            corrections: Suggestions de suggest_corrections (liste de dicts ou
+                         DataFrame avec 'index', 'suggested_label' et
+                         éventuellement 'confidence'), ou Series index -> label
+            inplace: Modifier df directement
+            label_column: Nom de la colonne de labels
+            
+        Returns:
+            DataFrame corrigé (df lui-même si inplace)
         """
-        corrected_df = df.copy()
+        new_labels, _ = self._corrections_to_series(corrections)
+        mask, new_values = self._align_corrections(df, new_labels)
         
-        for correction in corrections:
-            idx = correction['index']
-            new_label = correction['suggested_label']
-            corrected_df.loc[idx, 'label'] = new_label
+        if inplace:
+            corrected_df = df
+            if mask.any():
+                corrected_df.loc[mask, label_column] = new_values
+        else:
+            labels = df[label_column].copy()
+            if mask.any():
+                labels.iloc[np.flatnonzero(mask)] = new_values
+            corrected_df = df.copy(deep=False)
+            corrected_df[label_column] = labels
         
-        logger.info(f"✅ {len(corrections)} corrections appliquées")
+        n_ignored = len(new_labels) - new_labels.index.isin(df.index[mask]).sum()
+        if n_ignored:
+            logger.warning(f"⚠️ {n_ignored} corrections ignorées (index absents)")
+        logger.info(f"✅ {mask.sum()} corrections appliquées")
         
         return corrected_df
+    
+    def correction_audit(self, df: pd.DataFrame,
+                         corrections: Union[List[Dict], pd.DataFrame, pd.Series],
+                         label_column: str = 'label') -> pd.DataFrame:
+        """
+        Journal des corrections que apply_corrections appliquerait à df
+        
+        Les anciens labels sont lus dans df : appeler cette méthode avant
+        apply_corrections(..., inplace=True).
+        
+        Args:
+            df: DataFrame à corriger
+            corrections: Voir apply_corrections
+            label_column: Nom de la colonne de labels
+            
+        Returns:
+            DataFrame (index, old_label, new_label, confidence), une ligne par
+            ligne de df corrigée
+        """
+        new_labels, confidences = self._corrections_to_series(corrections)
+        mask, new_values = self._align_corrections(df, new_labels)
+        corrected_index = df.index[mask]
+        
+        return pd.DataFrame({
+            'index': corrected_index,
+            'old_label': df.loc[mask, label_column].to_numpy(),
+            'new_label': new_values,
+            'confidence': confidences.reindex(corrected_index).to_numpy()
+        })
+    
+    @staticmethod
+    def _align_corrections(df: pd.DataFrame, new_labels: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lignes de df concernées et nouveaux labels, alignés sur l'index de df
+        
+        Args:
+            df: DataFrame à corriger
+            new_labels: Series index -> label suggéré, sans doublons
+            
+        Returns:
+            (masque booléen des lignes corrigées, nouveaux labels de ces lignes)
+        """
+        mask = df.index.isin(new_labels.index)
+        return mask, new_labels.reindex(df.index[mask]).to_numpy()
+    
+    @staticmethod
+    def _corrections_to_series(corrections: Union[List[Dict], pd.DataFrame, pd.Series]) -> Tuple[pd.Series, pd.Series]:
+        """
+        Nouveaux labels et niveaux de confiance indexés par index de ligne
+        
+        Args:
+            corrections: Voir apply_corrections
+            
+        Returns:
+            (Series index -> label suggéré, Series index -> confiance), sans doublons
+        """
+        if isinstance(corrections, pd.Series):
+            new_labels = corrections
+            confidences = pd.Series(None, index=corrections.index, dtype=object)
+        else:
+            corrections_df = corrections if isinstance(corrections, pd.DataFrame) else pd.DataFrame(list(corrections))
+            if len(corrections_df) == 0:
+                return pd.Series(dtype=object), pd.Series(dtype=object)
+            index = pd.Index(corrections_df['index'])
+            new_labels = pd.Series(corrections_df['suggested_label'].to_numpy(), index=index)
+            if 'confidence' in corrections_df:
+                confidences = pd.Series(corrections_df['confidence'].to_numpy(), index=index)
+            else:
+                confidences = pd.Series(None, index=index, dtype=object)
+        
+        # La dernière correction d'un même index l'emporte
+        keep = ~new_labels.index.duplicated(keep='last')
+        return new_labels[keep], confidences[keep]
+
+
+class StreamingSuspectRanker:
+    """
+    Classement des échantillons suspects d'un flux de chunks
+
+    Chaque chunk passe par la détection vectorisée de LabelCleaner ; seuls
+    les top_n conflits de plus forte confiance sont conservés dans un tas
+    (à confiance égale, le premier arrivé est gardé). Les totaux sont
+    comptés par split.
+    """
+
+    def __init__(self, cleaner: LabelCleaner, top_n: int = 1000,
+                 threshold: float = 0.3,
+                 text_column: str = 'combined_text',
+                 label_column: str = 'label'):
+        """
+        Initialise le classement
+
+        Args:
+            cleaner: LabelCleaner utilisé pour la détection
+            top_n: Nombre de suspects conservés
+            threshold: Seuil de polarité pour considérer un conflit
+            text_column: Nom de la colonne de texte (sinon title + " " + content)
+            label_column: Nom de la colonne de labels
+        """
+        self.cleaner = cleaner
+        self.top_n = top_n
+        self.threshold = threshold
+        self.text_column = text_column
+        self.label_column = label_column
+        self.counters = {}
+        # Tas min de (confiance, -rang d'arrivée, conflit)
+        self._heap = []
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def update(self, chunk, split: str = 'train') -> int:
+        """
+        Analyse un chunk et met à jour le classement et les compteurs
+
+        Args:
+            chunk: DataFrame, lot {colonne: valeurs} ou liste d'échantillons
+            split: Nom du split
+
+        Returns:
+            Nombre de conflits dans le chunk
+        """
+        counters = self.counters.setdefault(split, {
+            'samples': 0,
+            'conflicts': 0,
+            'positive_label_conflicts': 0,
+            'negative_label_conflicts': 0,
+            'keyword_conflicts': 0
+        })
+
+        chunk_df = chunk_to_frame(chunk, self.text_column, offset=counters['samples'])
+        conflicts = self.cleaner.detect_conflicts(chunk_df[self.text_column],
+                                                  chunk_df[self.label_column],
+                                                  self.threshold)
+        counters['samples'] += len(chunk_df)
+        if len(conflicts) == 0:
+            return 0
+
+        # Compteurs par règle (un conflit peut relever de plusieurs règles)
+        is_positive = conflicts['actual_label'] == 1
+        counters['conflicts'] += len(conflicts)
+        counters['positive_label_conflicts'] += int((is_positive & (conflicts['polarity'] < -self.threshold)).sum())
+        counters['negative_label_conflicts'] += int(((conflicts['actual_label'] == 0) &
+                                                     (conflicts['polarity'] > self.threshold)).sum())
+        counters['keyword_conflicts'] += int((is_positive &
+                                              (conflicts['negative_keywords'] > conflicts['positive_keywords']) &
+                                              (conflicts['negative_keywords'] >= 2)).sum())
+
+        # Tas plein : seuls les conflits strictement plus confiants que le minimum entrent
+        n_conflicts = len(conflicts)
+        if self.top_n <= 0:
+            return n_conflicts
+        if len(self._heap) >= self.top_n:
+            conflicts = conflicts[conflicts['confidence_score'] > self._heap[0][0]]
+
+        conflicts = conflicts.assign(split=split)
+        for conflict in conflicts.to_dict('records'):
+            entry = (conflict['confidence_score'], -self._sequence, conflict)
+            self._sequence += 1
+            if len(self._heap) < self.top_n:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+        return n_conflicts
+
+    def top_conflicts(self) -> pd.DataFrame:
+        """
+        Suspects conservés, par confiance décroissante
+
+        Returns:
+            DataFrame au schéma de detect_mislabeled (+ colonne 'split'),
+            utilisable par suggest_corrections
+        """
+        entries = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        return pd.DataFrame([conflict for _, _, conflict in entries])
 
 
 def main():
@@ -5,16 +5,23 @@ Inclut toutes les techniques modernes de NLP
 
 import re
 import string
+import sys
 import unicodedata
-from typing import List, Dict, Optional, Union, Tuple
+import copy
+import pickle
+import itertools
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Optional, Union, Tuple, Iterable
 import logging
 
 import pandas as pd
 import numpy as np
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import word_tokenize, sent_tokenize, NLTKWordTokenizer
 from nltk.stem import WordNetLemmatizer, PorterStemmer
+from nltk.tokenize import punkt
 from nltk.chunk import ne_chunk
 from nltk.tag import pos_tag
 
@@ -22,6 +29,8 @@ from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.preprocessing import LabelEncoder
 import spacy
 from textblob import TextBlob
+from textblob._text import EMOTICONS, PUNCTUATION as PATTERN_PUNCTUATION
+from textblob.en import parser as pattern_parser, sentiment as pattern_sentiment
 import contractions
 import emoji
 
@@ -29,32 +38,591 @@ import emoji
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Paramètres de nettoyage par défaut de preprocess_text / preprocess_batch
+DEFAULT_CLEAN_PARAMS = {
+    'remove_urls': True,
+    'remove_emails': True,
+    'remove_phones': True,
+    'remove_html': True,
+    'expand_contractions': True,
+    'handle_emojis': 'remove'
+}
+
+
+# Ressources NLTK : nom -> chemin dans nltk_data
+# (depuis NLTK 3.8.2, word_tokenize utilise punkt_tab au lieu de punkt)
+PUNKT_RESOURCE = 'punkt_tab' if hasattr(punkt, 'PunktTokenizer') else 'punkt'
+NLTK_RESOURCES = {
+    PUNKT_RESOURCE: f'tokenizers/{PUNKT_RESOURCE}',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words',
+    'omw-1.4': 'corpora/omw-1.4'
+}
+
+# Ressources sans lesquelles le preprocessing ne peut pas fonctionner
+REQUIRED_NLTK_RESOURCES = (PUNKT_RESOURCE, 'stopwords', 'wordnet')
+
+# Vérification effectuée une seule fois par processus
+_nltk_resources_checked = False
+
+# Sans ponctuation, seules les règles de contractions de word_tokenize
+# (cannot, gonna, wanna...) peuvent découper un mot
+PUNCTUATION_CHAR_PATTERN = re.compile(r'[^\w\s]')
+WORD_TOKENIZER_CONTRACTIONS = NLTKWordTokenizer.CONTRACTIONS2 + NLTKWordTokenizer.CONTRACTIONS3
+
+# Séparateur des textes joints par tokenize_batch : le caractère nul est une
+# "ponctuation" ([^\w\s]), donc absent des textes du chemin rapide, et les
+# espaces gardent les frontières de mots de chaque texte
+BATCH_TOKEN_SEPARATOR = " \x00 "
+
+# Moteurs d'analyse de sentiment (voir AdvancedTextPreprocessor.analyze_sentiment)
+SENTIMENT_BACKENDS = ('textblob', 'fast')
+
+# Nombre d'ensembles de stop words personnalisés (custom_stopwords de
+# remove_stopwords) gardés en cache par preprocesseur
+CUSTOM_STOPWORDS_CACHE_SIZE = 32
+
+# Groupes de features : chaque groupe a un coût propre (les features de
+# surface sont de simples comptages, les autres demandent un analyseur)
+FEATURE_GROUPS = {
+    'surface': [
+        'text_length', 'word_count', 'avg_word_length', 'exclamation_count',
+        'question_count', 'comma_count', 'period_count', 'punctuation_ratio',
+        'upper_case_count', 'upper_case_ratio', 'title_case_words'
+    ],
+    'lexical': ['sentence_count', 'unique_word_ratio'],
+    'sentiment': ['polarity', 'subjectivity'],
+    'spacy': ['named_entities', 'pos_tags']
+}
+
+# Ordre des colonnes de extract_features et dtype compact de chacune
+FEATURE_DTYPES = {
+    'text_length': 'int32',
+    'word_count': 'int32',
+    'sentence_count': 'int32',
+    'avg_word_length': 'float32',
+    'exclamation_count': 'int32',
+    'question_count': 'int32',
+    'comma_count': 'int32',
+    'period_count': 'int32',
+    'punctuation_ratio': 'float32',
+    'upper_case_count': 'int32',
+    'upper_case_ratio': 'float32',
+    'title_case_words': 'int32',
+    'polarity': 'float32',
+    'subjectivity': 'float32',
+    'unique_word_ratio': 'float32',
+    'named_entities': 'int32',
+    'pos_tags': 'int32'
+}
+
+
+def resolve_feature_set(feature_set: Optional[Union[str, Iterable[str]]] = None) -> List[str]:
+    """
+    Résout un ensemble de features en liste ordonnée de colonnes
+
+    Args:
+        feature_set: Groupes ('surface', 'lexical', 'sentiment', 'spacy')
+                     et/ou noms de features ; None = toutes les features
+
+    Returns:
+        Colonnes demandées, dans l'ordre de extract_features
+
+    Raises:
+        ValueError: Si un groupe ou une feature est inconnu
+    """
+    if feature_set is None:
+        return list(FEATURE_DTYPES)
+
+    if isinstance(feature_set, str):
+        feature_set = [feature_set]
+
+    requested = set()
+    for name in feature_set:
+        if name in FEATURE_GROUPS:
+            requested.update(FEATURE_GROUPS[name])
+        elif name in FEATURE_DTYPES:
+            requested.add(name)
+        else:
+            raise ValueError(f"Groupe ou feature inconnu: {name}")
+
+    return [column for column in FEATURE_DTYPES if column in requested]
+
+PUNCTUATION_PATTERN = '[' + re.escape(string.punctuation) + ']'
+
+# Table str.translate supprimant les majuscules (construite à la demande)
+_uppercase_delete_table = None
+
+
+def _get_uppercase_delete_table() -> Dict[int, None]:
+    """Table de traduction supprimant tous les caractères tels que char.isupper()"""
+    global _uppercase_delete_table
+    if _uppercase_delete_table is None:
+        _uppercase_delete_table = {
+            codepoint: None for codepoint in range(sys.maxunicode + 1) if chr(codepoint).isupper()
+        }
+    return _uppercase_delete_table
+
+
+def ensure_nltk_resources(offline: bool = False):
+    """
+    Vérifie (et télécharge si besoin) les ressources NLTK, une fois par processus
+
+    Args:
+        offline: Ne jamais accéder au réseau ; lève une erreur si une
+                 ressource indispensable est absente
+
+    Raises:
+        LookupError: En mode offline, si une ressource indispensable manque
+    """
+    global _nltk_resources_checked
+
+    if _nltk_resources_checked:
+        return
+
+    missing = []
+    for resource, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(resource)
+
+    if offline:
+        missing_required = [resource for resource in missing if resource in REQUIRED_NLTK_RESOURCES]
+        if missing_required:
+            raise LookupError(
+                f"Ressources NLTK manquantes en mode offline: {', '.join(missing_required)}. "
+                f"Installez-les au préalable avec: python -m nltk.downloader {' '.join(missing_required)}"
+            )
+        for resource in missing:
+            logger.warning(f"Ressource NLTK optionnelle absente (mode offline): {resource}")
+    else:
+        for resource in missing:
+            try:
+                if not nltk.download(resource, quiet=True):
+                    logger.warning(f"Impossible de télécharger {resource}")
+            except:
+                logger.warning(f"Impossible de télécharger {resource}")
+
+    _nltk_resources_checked = True
+
+
+class TokenCache:
+    """
+    Cache token -> forme normalisée (lemme, racine) borné avec éviction LRU
+    """
+
+    def __init__(self, maxsize: int = 100000):
+        """
+        Initialise le cache
+
+        Args:
+            maxsize: Nombre maximal d'entrées (0 = cache désactivé)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def map(self, tokens: List[str], compute) -> List[str]:
+        """
+        Applique compute à chaque token en passant par le cache
+
+        Args:
+            tokens: Liste de tokens
+            compute: Fonction token -> forme normalisée
+
+        Returns:
+            Formes normalisées, dans l'ordre des tokens
+        """
+        if self.maxsize <= 0:
+            self.misses += len(tokens)
+            return [compute(token) for token in tokens]
+
+        data = self._data
+        results = []
+        hits = 0
+
+        for token in tokens:
+            value = data.get(token)
+            if value is None:
+                value = compute(token)
+                data[token] = value
+                if len(data) > self.maxsize:
+                    data.popitem(last=False)
+            else:
+                data.move_to_end(token)
+                hits += 1
+            results.append(value)
+
+        self.hits += hits
+        self.misses += len(tokens) - hits
+        return results
+
+    def lookup(self, token: str, compute) -> str:
+        """
+        Forme normalisée d'un token, calculée par compute si absente du cache
+
+        Args:
+            token: Token
+            compute: Fonction token -> forme normalisée
+
+        Returns:
+            Forme normalisée
+        """
+        if self.maxsize <= 0:
+            self.misses += 1
+            return compute(token)
+
+        data = self._data
+        value = data.get(token)
+        if value is None:
+            self.misses += 1
+            value = compute(token)
+            data[token] = value
+            if len(data) > self.maxsize:
+                data.popitem(last=False)
+        else:
+            self.hits += 1
+            data.move_to_end(token)
+        return value
+
+    def update(self, items: List[Tuple[str, str]]):
+        """
+        Insère des entrées (du moins au plus récemment utilisé)
+
+        Args:
+            items: Couples (token, forme normalisée)
+        """
+        if self.maxsize <= 0:
+            return
+        for token, value in items:
+            self._data[token] = value
+            self._data.move_to_end(token)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def items(self) -> List[Tuple[str, str]]:
+        """Entrées du moins au plus récemment utilisé"""
+        return list(self._data.items())
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict:
+        """Compteurs de succès/échecs et occupation du cache"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0,
+            'size': len(self._data),
+            'maxsize': self.maxsize
+        }
+
+
+class CompiledCleaner:
+    """
+    Version compilée de AdvancedTextPreprocessor.clean_text
+
+    Nettoyeur multi-passes avec pré-filtres : le plan de nettoyage est résolu
+    une seule fois à partir des paramètres activés, puis chaque étape reste
+    une passe distincte (normalisation NFKD, demojize, contractions.fix,
+    substitutions regex) mais n'est exécutée que si un pré-filtre exact
+    montre qu'elle peut modifier le document. Seules la suppression des
+    téléphones et la réduction des espaces partagent une même passe.
+    La sortie est identique à celle de clean_text.
+    """
+
+    # Caractères que demojize peut modifier : premier caractère de chaque
+    # emoji connu et sélecteurs de variante isolés (construit à la demande)
+    _emoji_trigger_chars = None
+
+    def __init__(self, preprocessor: 'AdvancedTextPreprocessor',
+                 remove_urls=True,
+                 remove_emails=True,
+                 remove_phones=True,
+                 remove_html=True,
+                 remove_mentions=True,
+                 remove_hashtags=False,
+                 expand_contractions=True,
+                 handle_emojis='remove',
+                 normalize_unicode=True):
+        """
+        Compile le plan de nettoyage
+
+        Args:
+            preprocessor: Preprocesseur fournissant les patterns de nettoyage
+            (autres paramètres identiques à clean_text)
+        """
+        self.normalize_unicode = normalize_unicode
+        self.handle_emojis = handle_emojis
+        self.expand_contractions = expand_contractions
+
+        if handle_emojis in ('remove', 'convert') and CompiledCleaner._emoji_trigger_chars is None:
+            CompiledCleaner._emoji_trigger_chars = frozenset(
+                [key[0] for key in emoji.EMOJI_DATA] + ['\ufe0e', '\ufe0f']
+            )
+
+        self.punctuation_pattern = re.compile(r'[^\w\s]')
+
+        # Substitutions déclenchées par un littéral obligatoire du pattern :
+        # si le littéral est absent du texte, le pattern ne peut pas matcher
+        self.leading_subs = []
+        if remove_html:
+            self.leading_subs.append(('<', preprocessor.html_pattern))
+        if remove_urls:
+            self.leading_subs.append(('://', preprocessor.url_pattern))
+        if remove_emails:
+            self.leading_subs.append(('@', preprocessor.email_pattern))
+
+        self.trailing_subs = []
+        if remove_mentions:
+            self.trailing_subs.append(('@', preprocessor.mention_pattern))
+        if remove_hashtags:
+            self.trailing_subs.append(('#', preprocessor.hashtag_pattern))
+
+        self.phone_pattern = preprocessor.phone_pattern if remove_phones else None
+        self.whitespace_pattern = re.compile(r'\s+')
+
+        # Téléphones et espaces en une passe : chaque suite d'espaces et de
+        # numéros consécutifs devient un seul espace
+        if remove_phones:
+            self.fused_pattern = re.compile(r'(?:\s|' + preprocessor.phone_pattern.pattern + r')+')
+        else:
+            self.fused_pattern = self.whitespace_pattern
+
+    def __call__(self, text: str) -> str:
+        """
+        Nettoie un document
+
+        Args:
+            text: Texte à nettoyer
+
+        Returns:
+            Texte nettoyé (identique à clean_text)
+        """
+        if not isinstance(text, str):
+            return ""
+
+        cleaned_text = text
+        is_ascii = text.isascii()
+
+        # NFKD est l'identité sur un texte ASCII
+        if self.normalize_unicode and not is_ascii:
+            cleaned_text = unicodedata.normalize('NFKD', cleaned_text)
+            is_ascii = cleaned_text.isascii()
+
+        # demojize ne modifie que les séquences commençant par un emoji
+        has_emoji = (not is_ascii and self.handle_emojis in ('remove', 'convert')
+                     and not self._emoji_trigger_chars.isdisjoint(cleaned_text))
+
+        if self.handle_emojis == 'remove':
+            if has_emoji:
+                cleaned_text = emoji.demojize(cleaned_text, delimiters=("", ""))
+            cleaned_text = self.punctuation_pattern.sub(' ', cleaned_text)
+        elif self.handle_emojis == 'convert' and has_emoji:
+            cleaned_text = emoji.demojize(cleaned_text)
+
+        if self.expand_contractions:
+            try:
+                cleaned_text = contractions.fix(cleaned_text)
+            except:
+                pass
+
+        for trigger, pattern in self.leading_subs:
+            if trigger in cleaned_text:
+                cleaned_text = pattern.sub(' ', cleaned_text)
+
+        # Mentions et hashtags passent après les téléphones : on ne fusionne
+        # que si aucun d'eux ne peut s'appliquer
+        if any(trigger in cleaned_text for trigger, _ in self.trailing_subs):
+            if self.phone_pattern is not None:
+                cleaned_text = self.phone_pattern.sub(' ', cleaned_text)
+            for trigger, pattern in self.trailing_subs:
+                cleaned_text = pattern.sub(' ', cleaned_text)
+            cleaned_text = self.whitespace_pattern.sub(' ', cleaned_text)
+        else:
+            cleaned_text = self.fused_pattern.sub(' ', cleaned_text)
+
+        return cleaned_text.strip()
+
+
+class FastSentimentScorer:
+    """
+    Score de sentiment équivalent à TextBlob(text).sentiment, sans TextBlob
+
+    Le lexique de TextBlob (en-sentiment.xml, y compris les adverbes en -ly
+    dérivés des adjectifs) est chargé une seule fois dans un dictionnaire
+    mot -> (polarité, subjectivité, intensité, modificateur) et les
+    émoticônes dans un dictionnaire émoticône -> polarité. Les tokens sont
+    ceux du tokeniseur de TextBlob et l'algorithme (modificateurs,
+    négations, points d'exclamation, émoticônes) est celui de
+    Sentiment.assessments : les résultats sont identiques à TextBlob
+    (écart < 1e-9), pour environ 3x moins de temps.
+    """
+
+    NEGATIONS = frozenset(("no", "not", "n't", "never"))
+
+    _shared_index = None
+
+    def __init__(self):
+        """Initialise le scoreur (index du lexique partagé par le processus)"""
+        if FastSentimentScorer._shared_index is None:
+            FastSentimentScorer._shared_index = self._build_index()
+        self.lexicon, self.emoticons = FastSentimentScorer._shared_index
+
+    @staticmethod
+    def _build_index() -> Tuple[Dict, Dict]:
+        """Construit les index du lexique et des émoticônes de TextBlob"""
+        lexicon = {}
+        for word, scores_by_pos in pattern_sentiment.items():
+            polarity, subjectivity, intensity = scores_by_pos[None]
+            lexicon[word] = (polarity, subjectivity, intensity, 'RB' in scores_by_pos)
+
+        emoticons = {}
+        for (_, polarity), faces in EMOTICONS.items():
+            for face in faces:
+                emoticons.setdefault(face.lower(), polarity)
+
+        return lexicon, emoticons
+
+    def tokenize(self, text: str) -> List[str]:
+        """Tokens en minuscules, découpés comme par TextBlob"""
+        return " ".join(pattern_parser.find_tokens(text)).lower().split()
+
+    def score_tokens(self, tokens: List[str]) -> Tuple[float, float]:
+        """
+        Polarité et subjectivité d'une suite de tokens en minuscules
+
+        Args:
+            tokens: Tokens (voir tokenize)
+
+        Returns:
+            (polarité, subjectivité), (0.0, 0.0) si aucun mot n'est connu
+        """
+        lexicon = self.lexicon
+        negations = self.NEGATIONS
+        # Évaluations : [polarité, subjectivité, intensité, négation]
+        assessments = []
+        modifier = None
+        negation = None
+
+        for word in tokens:
+            entry = lexicon.get(word)
+            if entry is not None:
+                polarity, subjectivity, intensity, is_modifier = entry
+                # Mot connu, éventuellement précédé d'un modificateur ("really good")
+                if modifier is None:
+                    assessments.append([polarity, subjectivity, intensity, 1])
+                else:
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(polarity * last[2], 1.0))
+                    last[1] = max(-1.0, min(subjectivity * last[2], 1.0))
+                    last[2] = intensity
+                # Précédé d'une négation ("not good")
+                if negation is not None:
+                    last = assessments[-1]
+                    last[2] = 1.0 / last[2]
+                    last[3] = -1
+                modifier = word if is_modifier else None
+                negation = word if word in negations else None
+            else:
+                # Négation inconnue du lexique, conservée à travers les petits mots
+                if word in negations:
+                    negation = word
+                elif negation and len(word.strip("'")) > 1:
+                    negation = None
+                # Négation précédée d'un adverbe ("really not good")
+                if negation is not None and modifier is not None and modifier.endswith("ly"):
+                    assessments[-1][3] = -1
+                    negation = None
+                elif modifier and len(word) > 2:
+                    modifier = None
+                # Les points d'exclamation renforcent le mot précédent
+                if word == "!" and assessments:
+                    assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+                # Sarcasme
+                if word == "(!)":
+                    assessments.append([0.0, 1.0, 1.0, 1])
+                # Émoticônes
+                if not word.isalpha() and len(word) <= 5 and word not in PATTERN_PUNCTUATION:
+                    polarity = self.emoticons.get(word)
+                    if polarity is not None:
+                        assessments.append([polarity, 1.0, 1.0, 1])
+
+        if not assessments:
+            return 0.0, 0.0
+
+        # "not good" = légèrement négatif, "not bad" = légèrement positif
+        polarity = sum(a[0] * -0.5 if a[3] < 0 else a[0] for a in assessments)
+        subjectivity = sum(a[1] for a in assessments)
+        return polarity / float(len(assessments)), subjectivity / float(len(assessments))
+
+    def __call__(self, text: str) -> Tuple[float, float]:
+        """Polarité et subjectivité du texte"""
+        return self.score_tokens(self.tokenize(text))
+
+
 class AdvancedTextPreprocessor:
     """
     Preprocesseur de texte avancé pour l'analyse de sentiment
     """
     
-    def __init__(self, language='english', use_spacy=True):
+    def __init__(self, language='english', use_spacy=True,
+                 custom_stopwords: Optional[Iterable[str]] = None,
+                 token_cache_size: int = 100000,
+                 token_cache_path: Optional[str] = None,
+                 offline: bool = False,
+                 sentiment_backend: str = 'textblob'):
         """
         Initialise le preprocesseur
         
         Args:
             language: Langue pour les stop words et lemmatisation
             use_spacy: Utiliser spaCy pour le preprocessing avancé
+            custom_stopwords: Stop words personnalisés ajoutés à ceux de NLTK
+            token_cache_size: Taille max des caches de lemmes et de racines (0 = désactivés)
+            token_cache_path: Fichier de caches à précharger (voir save_token_caches)
+            offline: Ne jamais télécharger les ressources NLTK (erreur immédiate si absentes)
+            sentiment_backend: 'textblob' ou 'fast' (FastSentimentScorer, mêmes scores)
         """
+        if sentiment_backend not in SENTIMENT_BACKENDS:
+            raise ValueError(f"sentiment_backend inconnu : {sentiment_backend!r} "
+                             f"(attendu : {', '.join(SENTIMENT_BACKENDS)})")
+        
         self.language = language
         self.use_spacy = use_spacy
+        self.offline = offline
+        self.sentiment_backend = sentiment_backend
+        self.sentiment_scorer = FastSentimentScorer() if sentiment_backend == 'fast' else None
         
         # Initialisation des outils NLTK
         self._download_nltk_resources()
         
-        # Stop words
-        self.stop_words = set(stopwords.words(language))
+        # Stop words (ensemble immuable, compilé une seule fois)
+        self.stop_words = frozenset(stopwords.words(language)).union(custom_stopwords or ())
+        self._custom_stop_words = TokenCache(CUSTOM_STOPWORDS_CACHE_SIZE)
         
         # Lemmatizer et stemmer
         self.lemmatizer = WordNetLemmatizer()
         self.stemmer = PorterStemmer()
         
+        # Caches LRU token -> lemme / racine (vocabulaire très zipfien)
+        self.lemma_cache = TokenCache(token_cache_size)
+        self.stem_cache = TokenCache(token_cache_size)
+        if token_cache_path and Path(token_cache_path).exists():
+            self.load_token_caches(token_cache_path)
+        
         # spaCy (optionnel)
         if use_spacy:
             try:
@@ -71,22 +639,16 @@ class AdvancedTextPreprocessor:
         self.html_pattern = re.compile(r'<[^>]+>')
         self.mention_pattern = re.compile(r'@\w+')
         self.hashtag_pattern = re.compile(r'#\w+')
-        
+
+        # Nettoyeurs compilés, indexés par paramètres de nettoyage
+        self._compiled_cleaners = {}
+
+        # Nombre d'analyses de sentiment TextBlob effectuées (instrumentation)
+        self.sentiment_evaluations = 0
+
     def _download_nltk_resources(self):
-        """Télécharge les ressources NLTK nécessaires"""
-        resources = [
-            'punkt', 'stopwords', 'wordnet', 'averaged_perceptron_tagger',
-            'maxent_ne_chunker', 'words', 'omw-1.4'
-        ]
-        
-        for resource in resources:
-            try:
-                nltk.data.find(f'tokenizers/{resource}')
-            except LookupError:
-                try:
-                    nltk.download(resource, quiet=True)
-                except:
-                    logger.warning(f"Impossible de télécharger {resource}")
+        """Télécharge les ressources NLTK nécessaires (une fois par processus)"""
+        ensure_nltk_resources(offline=self.offline)
     
     def clean_text(self, text: str, 
                    remove_urls=True, 
@@ -164,6 +726,23 @@ class AdvancedTextPreprocessor:
         cleaned_text = cleaned_text.strip()
         
         return cleaned_text
+
+    def compile_cleaner(self, **clean_params) -> CompiledCleaner:
+        """
+        Retourne le nettoyeur compilé pour les paramètres donnés (mis en cache)
+
+        Args:
+            **clean_params: Paramètres de clean_text
+
+        Returns:
+            CompiledCleaner produisant la même sortie que clean_text
+        """
+        key = tuple(sorted(clean_params.items()))
+        cleaner = self._compiled_cleaners.get(key)
+        if cleaner is None:
+            cleaner = CompiledCleaner(self, **clean_params)
+            self._compiled_cleaners[key] = cleaner
+        return cleaner
     
     def tokenize(self, text: str, method='nltk') -> List[str]:
         """
@@ -184,28 +763,106 @@ class AdvancedTextPreprocessor:
             return [token.text for token in doc if not token.is_space]
         
         elif method == 'nltk':
-            return word_tokenize(text.lower())
+            text = text.lower()
+            # Texte sans ponctuation (sortie de clean_text) : ni Punkt ni les
+            # règles Treebank ne s'appliquent, sauf les contractions
+            if PUNCTUATION_CHAR_PATTERN.search(text) is None:
+                text = " " + text + " "
+                for regexp in WORD_TOKENIZER_CONTRACTIONS:
+                    text = regexp.sub(r" \1 \2 ", text)
+                return text.split()
+            return word_tokenize(text)
         
         else:  # simple
             return text.lower().split()
     
+    def tokenize_batch(self, texts: List[str], method='nltk') -> List[List[str]]:
+        """
+        Tokenise un lot de textes (même résultat que tokenize texte par texte)
+
+        Avec la méthode 'nltk', les textes sans ponctuation (sortie de
+        clean_text) sont joints par BATCH_TOKEN_SEPARATOR : chaque règle de
+        contraction n'est appliquée qu'une fois à tout le lot au lieu d'une
+        fois par texte. Les autres textes passent par word_tokenize.
+
+        Args:
+            texts: Textes à tokeniser
+            method: 'nltk', 'spacy', ou 'simple'
+
+        Returns:
+            Liste de tokens par texte
+        """
+        if method != 'nltk':
+            return [self.tokenize(text, method=method) for text in texts]
+
+        token_lists = [[] for _ in texts]
+        fast_positions = []
+        fast_texts = []
+        for position, text in enumerate(texts):
+            if not text:
+                continue
+            text = text.lower()
+            if PUNCTUATION_CHAR_PATTERN.search(text) is None:
+                fast_positions.append(position)
+                fast_texts.append(text)
+            else:
+                token_lists[position] = word_tokenize(text)
+
+        if fast_texts:
+            joined = " " + BATCH_TOKEN_SEPARATOR.join(fast_texts) + " "
+            for regexp in WORD_TOKENIZER_CONTRACTIONS:
+                joined = regexp.sub(r" \1 \2 ", joined)
+            for position, text in zip(fast_positions, joined.split("\x00")):
+                token_lists[position] = text.split()
+
+        return token_lists
+
+    def with_stopwords(self, custom_stopwords: Iterable[str]) -> 'AdvancedTextPreprocessor':
+        """
+        Crée un preprocesseur avec des stop words supplémentaires
+
+        L'ensemble est compilé une seule fois ; le nouveau preprocesseur
+        partage tous les autres outils (lemmatizer, caches, patterns...).
+
+        Args:
+            custom_stopwords: Stop words personnalisés à ajouter
+
+        Returns:
+            Nouveau preprocesseur
+        """
+        preprocessor = copy.copy(self)
+        preprocessor.stop_words = self.stop_words.union(custom_stopwords)
+        preprocessor._custom_stop_words = TokenCache(CUSTOM_STOPWORDS_CACHE_SIZE)
+        return preprocessor
+
+    def _lowercases(self, method: str) -> bool:
+        """Indique si tokenize(text, method) renvoie des tokens en minuscules"""
+        return not (method == 'spacy' and self.use_spacy)
+
     def remove_stopwords(self, tokens: List[str], 
-                        custom_stopwords: Optional[List[str]] = None) -> List[str]:
+                        custom_stopwords: Optional[List[str]] = None,
+                        lowercased: bool = False) -> List[str]:
         """
         Supprime les stop words
         
         Args:
             tokens: Liste de tokens
-            custom_stopwords: Stop words personnalisés à ajouter
+            custom_stopwords: Stop words personnalisés à ajouter (les
+                              derniers ensembles utilisés sont gardés dans un
+                              cache LRU borné ; pour une liste fixe, préférer
+                              with_stopwords)
+            lowercased: Les tokens sont déjà en minuscules (pas de lower() par token)
             
         Returns:
             Tokens sans stop words
         """
-        stop_words = self.stop_words.copy()
+        stop_words = self.stop_words
         
         if custom_stopwords:
-            stop_words.update(custom_stopwords)
+            stop_words = self._custom_stop_words.lookup(frozenset(custom_stopwords), self.stop_words.union)
         
+        if lowercased:
+            return [token for token in tokens if token not in stop_words]
         return [token for token in tokens if token.lower() not in stop_words]
     
     def lemmatize(self, tokens: List[str], method='nltk') -> List[str]:
@@ -224,7 +881,7 @@ class AdvancedTextPreprocessor:
             return [token.lemma_ for token in doc if not token.is_space]
         
         else:  # nltk
-            return [self.lemmatizer.lemmatize(token) for token in tokens]
+            return self.lemma_cache.map(tokens, self.lemmatizer.lemmatize)
     
     def stem(self, tokens: List[str]) -> List[str]:
         """
@@ -236,7 +893,46 @@ class AdvancedTextPreprocessor:
         Returns:
             Tokens stemmés
         """
-        return [self.stemmer.stem(token) for token in tokens]
+        return self.stem_cache.map(tokens, self.stemmer.stem)
+
+    def cache_stats(self) -> Dict:
+        """
+        Statistiques des caches de lemmatisation et de stemming
+
+        Returns:
+            Dictionnaire {'lemma': {...}, 'stem': {...}}
+        """
+        return {
+            'lemma': self.lemma_cache.stats(),
+            'stem': self.stem_cache.stats()
+        }
+
+    def save_token_caches(self, path: str):
+        """
+        Sauvegarde les caches sur disque pour préchauffer d'autres processus
+
+        Args:
+            path: Fichier de sortie (pickle)
+        """
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'lemma': self.lemma_cache.items(),
+                'stem': self.stem_cache.items()
+            }, f)
+        logger.info(f"💾 Caches sauvegardés: {len(self.lemma_cache)} lemmes, {len(self.stem_cache)} racines")
+
+    def load_token_caches(self, path: str):
+        """
+        Précharge les caches depuis un fichier créé par save_token_caches
+
+        Args:
+            path: Fichier de caches (pickle)
+        """
+        with open(path, 'rb') as f:
+            caches = pickle.load(f)
+        self.lemma_cache.update(caches.get('lemma', []))
+        self.stem_cache.update(caches.get('stem', []))
+        logger.info(f"🔥 Caches préchargés: {len(self.lemma_cache)} lemmes, {len(self.stem_cache)} racines")
     
     def filter_tokens(self, tokens: List[str], 
                      min_length=2, 
@@ -260,11 +956,12 @@ class AdvancedTextPreprocessor:
         
         for token in tokens:
             # Longueur
-            if len(token) < min_length or len(token) > max_length:
+            length = len(token)
+            if length < min_length or length > max_length:
                 continue
             
             # Caractères uniques
-            if remove_single_chars and len(token) == 1:
+            if remove_single_chars and length == 1:
                 continue
             
             # Alphabétique seulement
@@ -274,58 +971,273 @@ class AdvancedTextPreprocessor:
             filtered_tokens.append(token)
         
         return filtered_tokens
+
+    def postprocess_tokens(self, tokens: List[str],
+                           remove_stopwords=True,
+                           lemmatize=True,
+                           stem=False,
+                           filter_tokens=True,
+                           lowercased=False,
+                           min_length=2,
+                           max_length=50,
+                           keep_alpha_only=True,
+                           remove_single_chars=True) -> List[str]:
+        """
+        Post-traitement fusionné des tokens en une seule passe
+
+        Applique dans l'ordre du pipeline la suppression des stop words, la
+        lemmatisation NLTK, le stemming et le filtrage, token par token, en ne
+        construisant qu'une seule liste de sortie. Équivalent à l'enchaînement
+        remove_stopwords -> lemmatize -> stem -> filter_tokens.
+
+        Args:
+            tokens: Liste de tokens
+            remove_stopwords: Supprimer les stop words
+            lemmatize: Lemmatiser (NLTK)
+            stem: Stemmer (après lemmatisation)
+            filter_tokens: Filtrer les tokens
+            lowercased: Les tokens sont déjà en minuscules
+            (autres paramètres identiques à filter_tokens)
+
+        Returns:
+            Tokens post-traités
+        """
+        stop_words = self.stop_words if remove_stopwords else None
+        lemma_lookup = self.lemma_cache.lookup
+        lemmatize_token = self.lemmatizer.lemmatize
+        stem_lookup = self.stem_cache.lookup
+        stem_token = self.stemmer.stem
+
+        processed_tokens = []
+
+        for token in tokens:
+            # Stop words
+            if stop_words is not None:
+                if (token if lowercased else token.lower()) in stop_words:
+                    continue
+
+            # Lemmatisation et stemming
+            if lemmatize:
+                token = lemma_lookup(token, lemmatize_token)
+            if stem:
+                token = stem_lookup(token, stem_token)
+
+            # Filtrage
+            if filter_tokens:
+                length = len(token)
+                if length < min_length or length > max_length:
+                    continue
+                if remove_single_chars and length == 1:
+                    continue
+                if keep_alpha_only and not token.isalpha():
+                    continue
+
+            processed_tokens.append(token)
+
+        return processed_tokens
     
-    def extract_features(self, text: str) -> Dict:
+    def _feature_columns(self, feature_set) -> List[str]:
+        """Colonnes demandées, sans les features spaCy si spaCy est désactivé"""
+        columns = resolve_feature_set(feature_set)
+        if not self.use_spacy:
+            columns = [column for column in columns if column not in FEATURE_GROUPS['spacy']]
+        return columns
+
+    def extract_features(self, text: str,
+                         feature_set: Optional[Union[str, Iterable[str]]] = None,
+                         tokens: Optional[List[str]] = None,
+                         sentiment: Optional[Dict] = None) -> Dict:
         """
         Extrait des features avancées du texte
         
         Args:
             text: Texte à analyser
+            feature_set: Groupes ('surface', 'lexical', 'sentiment', 'spacy')
+                         et/ou noms de features à calculer ; None = toutes
+            tokens: Résultat de tokenize(text) s'il est déjà calculé
+            sentiment: Résultat de analyze_sentiment(text) s'il est déjà calculé
             
         Returns:
-            Dictionnaire des features
+            Dictionnaire des features demandées
         """
+        columns = self._feature_columns(feature_set)
+        wanted = set(columns)
         features = {}
         
         # Features de base
         features['text_length'] = len(text)
-        features['word_count'] = len(text.split())
-        features['sentence_count'] = len(sent_tokenize(text))
-        features['avg_word_length'] = np.mean([len(word) for word in text.split()]) if text.split() else 0
+        if wanted & {'word_count', 'avg_word_length', 'title_case_words'}:
+            words = text.split()
+            features['word_count'] = len(words)
+            features['avg_word_length'] = np.mean([len(word) for word in words]) if words else 0
+            features['title_case_words'] = sum(1 for word in words if word.istitle())
+        if 'sentence_count' in wanted:
+            features['sentence_count'] = len(sent_tokenize(text))
         
         # Features de ponctuation
         features['exclamation_count'] = text.count('!')
         features['question_count'] = text.count('?')
         features['comma_count'] = text.count(',')
         features['period_count'] = text.count('.')
-        features['punctuation_ratio'] = sum(1 for char in text if char in string.punctuation) / len(text) if text else 0
+        if 'punctuation_ratio' in wanted:
+            features['punctuation_ratio'] = sum(1 for char in text if char in string.punctuation) / len(text) if text else 0
         
         # Features de casse
-        features['upper_case_count'] = sum(1 for char in text if char.isupper())
-        features['upper_case_ratio'] = features['upper_case_count'] / len(text) if text else 0
-        features['title_case_words'] = sum(1 for word in text.split() if word.istitle())
+        if wanted & {'upper_case_count', 'upper_case_ratio'}:
+            features['upper_case_count'] = sum(1 for char in text if char.isupper())
+            features['upper_case_ratio'] = features['upper_case_count'] / len(text) if text else 0
         
         # Features de sentiment (TextBlob)
-        try:
-            blob = TextBlob(text)
-            features['polarity'] = blob.sentiment.polarity
-            features['subjectivity'] = blob.sentiment.subjectivity
-        except:
-            features['polarity'] = 0
-            features['subjectivity'] = 0
+        if wanted & {'polarity', 'subjectivity'}:
+            if sentiment is None:
+                sentiment = self.analyze_sentiment(text)
+            features['polarity'] = sentiment['polarity']
+            features['subjectivity'] = sentiment['subjectivity']
         
         # Features lexicales
-        tokens = self.tokenize(text)
-        unique_tokens = set(tokens)
-        features['unique_word_ratio'] = len(unique_tokens) / len(tokens) if tokens else 0
+        if 'unique_word_ratio' in wanted:
+            if tokens is None:
+                tokens = self.tokenize(text)
+            unique_tokens = set(tokens)
+            features['unique_word_ratio'] = len(unique_tokens) / len(tokens) if tokens else 0
         
         # Features spaCy (si disponible)
-        if self.use_spacy:
+        if wanted & {'named_entities', 'pos_tags'}:
             doc = self.nlp(text)
             features['named_entities'] = len(doc.ents)
             features['pos_tags'] = len(set([token.pos_ for token in doc]))
         
-        return features
+        return {column: features[column] for column in columns}
+
+    def analyze_sentiment(self, text: str) -> Dict:
+        """
+        Analyse le sentiment d'un document avec TextBlob (ou avec
+        FastSentimentScorer si sentiment_backend='fast')
+
+        Le résultat est destiné à être calculé une seule fois par document et
+        partagé entre les features (polarity, subjectivity) et la détection
+        des labels suspects. Chaque analyse incrémente sentiment_evaluations.
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Dictionnaire {'polarity', 'subjectivity', 'predicted_label'}
+            (0 partout en cas d'erreur)
+        """
+        self.sentiment_evaluations += 1
+        try:
+            if self.sentiment_scorer is not None:
+                polarity, subjectivity = self.sentiment_scorer(text)
+            else:
+                sentiment = TextBlob(text).sentiment
+                polarity, subjectivity = sentiment.polarity, sentiment.subjectivity
+        except:
+            polarity, subjectivity = 0, 0
+        return {
+            'polarity': polarity,
+            'subjectivity': subjectivity,
+            'predicted_label': 1 if polarity > 0 else 0
+        }
+
+    def extract_features_batch(self, texts: Union[Iterable[str], pd.Series],
+                               feature_set: Optional[Union[str, Iterable[str]]] = None,
+                               sentiments: Optional[List[Dict]] = None) -> pd.DataFrame:
+        """
+        Extrait les features de extract_features pour tout un lot de textes
+
+        Les statistiques de surface (longueurs, ponctuation, casse) sont
+        calculées avec les méthodes vectorisées de pandas sur la colonne
+        entière ; seules les features nécessitant un analyseur (phrases,
+        sentiment, tokens, spaCy) restent calculées document par document.
+        Seuls les groupes demandés dans feature_set sont calculés.
+
+        Args:
+            texts: Textes à analyser (les valeurs non textuelles comptent comme "")
+            feature_set: Groupes et/ou noms de features (voir extract_features)
+            sentiments: Résultats de analyze_sentiment, un par texte, s'ils
+                        sont déjà calculés
+
+        Returns:
+            DataFrame colonnaire (int32/float32), une ligne par texte, avec
+            les colonnes demandées ; l'index d'une Series est conservé
+        """
+        columns = self._feature_columns(feature_set)
+        wanted = set(columns)
+
+        if isinstance(texts, pd.Series):
+            index = texts.index
+            texts = texts.tolist()
+        else:
+            texts = list(texts)
+            index = None
+        series = pd.Series([text if isinstance(text, str) else "" for text in texts], dtype=object)
+
+        features = {}
+        text_length = series.str.len().to_numpy()
+        has_text = text_length > 0
+        safe_length = np.where(has_text, text_length, 1)
+        features['text_length'] = text_length
+
+        # Mots (séparés comme par str.split) : la somme de leurs longueurs est
+        # le nombre de caractères non blancs
+        if wanted & {'word_count', 'avg_word_length'}:
+            word_count = series.str.count(r'\S+').to_numpy()
+            non_space_chars = text_length - series.str.count(r'\s').to_numpy()
+            features['word_count'] = word_count
+            features['avg_word_length'] = np.where(word_count > 0, non_space_chars / np.maximum(word_count, 1), 0)
+        if 'title_case_words' in wanted:
+            words = series.str.split().explode().dropna().astype(str)
+            features['title_case_words'] = (
+                words.str.istitle().groupby(level=0).sum()
+                .reindex(series.index, fill_value=0).to_numpy()
+            )
+        if 'sentence_count' in wanted:
+            features['sentence_count'] = [len(sent_tokenize(text)) for text in series]
+
+        # Ponctuation
+        for column, pattern in (('exclamation_count', '!'), ('question_count', r'\?'),
+                                ('comma_count', ','), ('period_count', r'\.')):
+            if column in wanted:
+                features[column] = series.str.count(pattern).to_numpy()
+        if 'punctuation_ratio' in wanted:
+            features['punctuation_ratio'] = np.where(
+                has_text, series.str.count(PUNCTUATION_PATTERN).to_numpy() / safe_length, 0
+            )
+
+        # Casse
+        if wanted & {'upper_case_count', 'upper_case_ratio'}:
+            upper_case_count = (text_length -
+                                series.str.translate(_get_uppercase_delete_table()).str.len().to_numpy())
+            features['upper_case_count'] = upper_case_count
+            features['upper_case_ratio'] = np.where(has_text, upper_case_count / safe_length, 0)
+
+        # Sentiment (TextBlob)
+        if wanted & {'polarity', 'subjectivity'}:
+            if sentiments is None:
+                sentiments = [self.analyze_sentiment(text) for text in series]
+            features['polarity'] = [sentiment['polarity'] for sentiment in sentiments]
+            features['subjectivity'] = [sentiment['subjectivity'] for sentiment in sentiments]
+
+        # Features lexicales
+        if 'unique_word_ratio' in wanted:
+            unique_word_ratio = []
+            for text in series:
+                tokens = self.tokenize(text)
+                unique_word_ratio.append(len(set(tokens)) / len(tokens) if tokens else 0)
+            features['unique_word_ratio'] = unique_word_ratio
+
+        # Features spaCy (si disponible)
+        if wanted & {'named_entities', 'pos_tags'}:
+            docs = list(self.nlp.pipe(series.tolist()))
+            features['named_entities'] = [len(doc.ents) for doc in docs]
+            features['pos_tags'] = [len(set(token.pos_ for token in doc)) for doc in docs]
+
+        features_df = pd.DataFrame({
+            column: np.asarray(features[column], dtype=FEATURE_DTYPES[column]) for column in columns
+        }, index=index if index is not None else pd.RangeIndex(len(series)))
+
+        return features_df
     
     def preprocess_text(self, text: str, 
                        full_pipeline=True,
@@ -335,7 +1247,8 @@ class AdvancedTextPreprocessor:
                        lemmatize=True,
                        stem=False,
                        filter_tokens=True,
-                       return_string=True) -> Union[str, List[str]]:
+                       return_string=True,
+                       compiled_cleaning=True) -> Union[str, List[str]]:
         """
         Pipeline complet de preprocessing
         
@@ -349,6 +1262,7 @@ class AdvancedTextPreprocessor:
             stem: Stemmer (après lemmatisation)
             filter_tokens: Filtrer les tokens
             return_string: Retourner une chaîne ou une liste
+            compiled_cleaning: Nettoyer avec le nettoyeur compilé (même sortie, plus rapide)
             
         Returns:
             Texte preprocessé
@@ -358,17 +1272,12 @@ class AdvancedTextPreprocessor:
         
         # Paramètres de nettoyage par défaut
         if clean_params is None:
-            clean_params = {
-                'remove_urls': True,
-                'remove_emails': True,
-                'remove_phones': True,
-                'remove_html': True,
-                'expand_contractions': True,
-                'handle_emojis': 'remove'
-            }
+            clean_params = DEFAULT_CLEAN_PARAMS
         
         # Nettoyage
-        if full_pipeline:
+        if full_pipeline and compiled_cleaning:
+            cleaned_text = self.compile_cleaner(**clean_params)(text)
+        elif full_pipeline:
             cleaned_text = self.clean_text(text, **clean_params)
         else:
             cleaned_text = text
@@ -376,28 +1285,208 @@ class AdvancedTextPreprocessor:
         # Tokenisation
         tokens = self.tokenize(cleaned_text, method=tokenize_method)
         
-        # Suppression des stop words
-        if remove_stopwords:
-            tokens = self.remove_stopwords(tokens)
-        
-        # Lemmatisation
-        if lemmatize:
+        # Lemmatisation spaCy : étapes séparées (analyse du document complet)
+        if lemmatize and tokenize_method == 'spacy' and self.use_spacy:
+            if remove_stopwords:
+                tokens = self.remove_stopwords(tokens)
             tokens = self.lemmatize(tokens, method=tokenize_method)
+            if stem:
+                tokens = self.stem(tokens)
+            if filter_tokens:
+                tokens = self.filter_tokens(tokens)
         
-        # Stemming
-        if stem:
-            tokens = self.stem(tokens)
-        
-        # Filtrage
-        if filter_tokens:
-            tokens = self.filter_tokens(tokens)
+        # Sinon : stop words, lemmatisation, stemming et filtrage en une passe
+        # (tokens déjà en minuscules sauf avec spaCy)
+        else:
+            tokens = self.postprocess_tokens(
+                tokens,
+                remove_stopwords=remove_stopwords,
+                lemmatize=lemmatize,
+                stem=stem,
+                filter_tokens=filter_tokens,
+                lowercased=self._lowercases(tokenize_method)
+            )
         
         # Retour
         if return_string:
             return ' '.join(tokens)
         else:
             return tokens
+
+    def preprocess_batch(self, texts: Iterable[str],
+                         full_pipeline=True,
+                         clean_params=None,
+                         tokenize_method='nltk',
+                         remove_stopwords=True,
+                         lemmatize=True,
+                         stem=False,
+                         filter_tokens=True,
+                         return_string=True,
+                         compiled_cleaning=True) -> Union[List[str], List[List[str]]]:
+        """
+        Pipeline de preprocessing appliqué étape par étape à tout un lot
+
+        La configuration (paramètres de nettoyage, options de post-traitement)
+        est résolue une seule fois pour le lot, puis chaque étape traite tous
+        les documents ensemble :
+        - nettoyage : une seule fois par document distinct ;
+        - tokenisation : règles de contraction appliquées une fois au lot
+          (voir tokenize_batch) ;
+        - stop words, lemmatisation, stemming et filtrage : calculés une
+          seule fois par token distinct du lot, puis appliqués par
+          dictionnaire à chaque document.
+        Le résultat est identique à celui de preprocess_text appliqué
+        document par document.
+
+        Args:
+            texts: Textes à preprocesser
+            (autres paramètres identiques à preprocess_text)
+
+        Returns:
+            Liste de textes preprocessés, ou liste de listes de tokens
+            si return_string=False
+        """
+        texts = list(texts)
+
+        # Documents invalides : sortie vide, comme preprocess_text
+        valid = [isinstance(text, str) and bool(text) for text in texts]
+        batch = [text for text, is_valid in zip(texts, valid) if is_valid]
+
+        if clean_params is None:
+            clean_params = DEFAULT_CLEAN_PARAMS
+
+        # Nettoyage (une fois par document distinct)
+        if full_pipeline:
+            if compiled_cleaning:
+                clean = self.compile_cleaner(**clean_params)
+            else:
+                def clean(text):
+                    return self.clean_text(text, **clean_params)
+            cleaned_texts = {text: clean(text) for text in dict.fromkeys(batch)}
+            batch = [cleaned_texts[text] for text in batch]
+
+        # Tokenisation
+        token_lists = self.tokenize_batch(batch, method=tokenize_method)
+
+        # Stop words, lemmatisation, stemming et filtrage
+        if lemmatize and tokenize_method == 'spacy' and self.use_spacy:
+            if remove_stopwords:
+                token_lists = [self.remove_stopwords(tokens) for tokens in token_lists]
+            token_lists = [self.lemmatize(tokens, method='spacy') for tokens in token_lists]
+            if stem:
+                token_lists = [self.stem(tokens) for tokens in token_lists]
+            if filter_tokens:
+                token_lists = [self.filter_tokens(tokens) for tokens in token_lists]
+        else:
+            postprocess_options = {
+                'remove_stopwords': remove_stopwords,
+                'lemmatize': lemmatize,
+                'stem': stem,
+                'filter_tokens': filter_tokens,
+                'lowercased': self._lowercases(tokenize_method)
+            }
+            # Chaque token est indépendant : post-traitement du vocabulaire du
+            # lot (None = token supprimé), puis simple lecture par document
+            vocabulary = {}
+            for token in set(itertools.chain.from_iterable(token_lists)):
+                processed_token = self.postprocess_tokens([token], **postprocess_options)
+                vocabulary[token] = processed_token[0] if processed_token else None
+            token_lists = [[token for token in map(vocabulary.__getitem__, tokens) if token is not None]
+                           for tokens in token_lists]
+
+        # Réinsertion des documents invalides à leur position
+        processed = iter(token_lists)
+        results = []
+        for is_valid in valid:
+            if not is_valid:
+                results.append("" if return_string else [])
+            elif return_string:
+                results.append(' '.join(next(processed)))
+            else:
+                results.append(next(processed))
+
+        return results
     
+    def analyze(self, text: str,
+                feature_set: Optional[Union[str, Iterable[str]]] = None,
+                sentiment: Optional[Dict] = None,
+                **preprocess_params) -> Tuple[Union[str, List[str]], Dict]:
+        """
+        Preprocessing et extraction de features en un seul appel
+
+        Le texte brut n'est tokenisé qu'une fois (word_tokenize) : les tokens
+        servent à unique_word_ratio et, sans nettoyage (full_pipeline=False,
+        méthode 'nltk'), au preprocessing lui-même. Le texte nettoyé, sans
+        ponctuation, est découpé par le chemin rapide exact de tokenize. Les
+        features gardent leur définition actuelle (calculées sur le texte brut).
+
+        Args:
+            text: Texte à analyser
+            feature_set: Groupes et/ou noms de features (voir extract_features)
+            sentiment: Résultat de analyze_sentiment(text) s'il est déjà calculé
+            **preprocess_params: Paramètres de preprocess_text
+
+        Returns:
+            (texte preprocessé, dictionnaire des features)
+        """
+        if not isinstance(text, str):
+            text = ""
+
+        raw_tokens = None
+        if 'unique_word_ratio' in self._feature_columns(feature_set):
+            raw_tokens = self.tokenize(text)
+
+        if (raw_tokens is not None and text
+                and not preprocess_params.get('full_pipeline', True)
+                and preprocess_params.get('tokenize_method', 'nltk') == 'nltk'):
+            tokens = self.postprocess_tokens(
+                raw_tokens,
+                remove_stopwords=preprocess_params.get('remove_stopwords', True),
+                lemmatize=preprocess_params.get('lemmatize', True),
+                stem=preprocess_params.get('stem', False),
+                filter_tokens=preprocess_params.get('filter_tokens', True),
+                lowercased=True
+            )
+            processed = ' '.join(tokens) if preprocess_params.get('return_string', True) else tokens
+        else:
+            processed = self.preprocess_text(text, **preprocess_params)
+
+        features = self.extract_features(text, feature_set=feature_set,
+                                         tokens=raw_tokens, sentiment=sentiment)
+        return processed, features
+
+    def analyze_batch(self, texts: Union[Iterable[str], pd.Series],
+                      feature_set: Optional[Union[str, Iterable[str]]] = None,
+                      sentiments: Optional[List[Dict]] = None,
+                      **preprocess_params) -> Tuple[List, pd.DataFrame]:
+        """
+        Preprocessing et extraction de features d'un lot de textes
+
+        Enchaîne simplement preprocess_batch et extract_features_batch sur les
+        mêmes textes. Contrairement à analyze, les tokens du texte brut ne sont
+        pas partagés entre les deux étapes : le gain vient du chemin rapide de
+        tokenize sur les textes nettoyés et des sentiments fournis par l'appelant.
+
+        Args:
+            texts: Textes à analyser
+            feature_set: Groupes et/ou noms de features (voir extract_features)
+            sentiments: Résultats de analyze_sentiment, un par texte, s'ils
+                        sont déjà calculés
+            **preprocess_params: Paramètres de preprocess_batch
+
+        Returns:
+            (liste des textes preprocessés, DataFrame des features)
+        """
+        if isinstance(texts, pd.Series):
+            texts_series = texts
+        else:
+            texts_series = pd.Series(list(texts), dtype=object)
+
+        processed = self.preprocess_batch(texts_series, **preprocess_params)
+        features_df = self.extract_features_batch(texts_series, feature_set=feature_set,
+                                                  sentiments=sentiments)
+        return processed, features_df
+
     def preprocess_dataframe(self, df: pd.DataFrame, 
                            text_column: str,
                            target_column: str = None,
@@ -424,8 +1513,8 @@ class AdvancedTextPreprocessor:
         processed_df = df.copy()
         
         # Preprocessing des textes
-        processed_df[new_column_name] = processed_df[text_column].apply(
-            lambda x: self.preprocess_text(x, **preprocess_params)
+        processed_df[new_column_name] = self.preprocess_batch(
+            processed_df[text_column], **preprocess_params
         )
         
         # Extraction de features
@@ -469,6 +1558,51 @@ class AdvancedTextPreprocessor:
             return CountVectorizer(**default_params)
 
 
+# Registre des preprocesseurs partagés du processus, par (langue, spaCy,
+# sentiment, fichier de caches, mode offline)
+_shared_preprocessors = {}
+
+
+def get_shared_preprocessor(language='english', use_spacy=False,
+                            sentiment_backend='textblob',
+                            token_cache_path: Optional[str] = None,
+                            offline: bool = False) -> AdvancedTextPreprocessor:
+    """
+    Retourne le preprocesseur partagé du processus pour
+    (language, use_spacy, sentiment_backend, token_cache_path, offline)
+
+    Le preprocesseur n'est construit qu'au premier appel (chargement NLTK,
+    stop words, compilation des regex). L'instance est commune à tous les
+    appelants du processus (pipeline, LabelCleaner...) : ses attributs et
+    caches sont les mêmes pour tous, et une modification faite par un
+    appelant est visible par tous les autres. Pour des stop words
+    personnalisés, utiliser with_stopwords (copie qui partage les ressources
+    chargées sans toucher à l'instance commune) ; pour tout autre réglage,
+    construire un AdvancedTextPreprocessor privé.
+
+    Args:
+        language: Langue pour les stop words et lemmatisation
+        use_spacy: Utiliser spaCy pour le preprocessing avancé
+        sentiment_backend: Moteur de sentiment ('textblob' ou 'fast')
+        token_cache_path: Fichier de caches préchargé à la construction
+                          (voir save_token_caches)
+        offline: Ne jamais télécharger les ressources NLTK (erreur immédiate si absentes)
+
+    Returns:
+        Preprocesseur partagé
+    """
+    key = (language, use_spacy, sentiment_backend,
+           str(token_cache_path) if token_cache_path else None, offline)
+    preprocessor = _shared_preprocessors.get(key)
+    if preprocessor is None:
+        preprocessor = AdvancedTextPreprocessor(language=language, use_spacy=use_spacy,
+                                                sentiment_backend=sentiment_backend,
+                                                token_cache_path=token_cache_path,
+                                                offline=offline)
+        _shared_preprocessors[key] = preprocessor
+    return preprocessor
+
+
 def main():
     """
     Fonction de test du preprocesseur
@@ -0,0 +1,147 @@
+"""
+Tests et benchmark du détecteur de labels bruités par confident learning
+"""
+
+import sys
+import time
+import random
+sys.path.append('src')
+
+import numpy as np
+import pandas as pd
+
+from src.confident_learning import ConfidentLearningDetector
+from src.label_cleaner import LabelCleaner
+from src.text_preprocessor import AdvancedTextPreprocessor
+
+POSITIVE_WORDS = ['great', 'love', 'excellent', 'perfect', 'works', 'recommend', 'happy', 'fantastic']
+NEGATIVE_WORDS = ['broken', 'refund', 'awful', 'returned', 'waste', 'cheap', 'failed', 'disappointed']
+FILLER_WORDS = ['the', 'product', 'it', 'was', 'and', 'this', 'item', 'my', 'for', 'with', 'after', 'days']
+
+
+def make_noisy_dataset(n_samples, noise_rate=0.05, words_per_review=40, seed=0):
+    """Avis synthétiques séparables dont une fraction des labels est inversée"""
+    rng = random.Random(seed)
+    texts, labels, flipped = [], [], []
+    for _ in range(n_samples):
+        label = rng.randint(0, 1)
+        sentiment_words = POSITIVE_WORDS if label == 1 else NEGATIVE_WORDS
+        words = [rng.choice(sentiment_words) if rng.random() < 0.3 else rng.choice(FILLER_WORDS)
+                 for _ in range(words_per_review)]
+        is_flipped = rng.random() < noise_rate
+        texts.append(" ".join(words))
+        labels.append(1 - label if is_flipped else label)
+        flipped.append(is_flipped)
+    return pd.DataFrame({'combined_text': texts, 'label': labels}), np.array(flipped)
+
+
+def make_detector(**kwargs):
+    """Détecteur léger pour les tests"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+    params = {'n_features': 2 ** 16, 'batch_size': 500}
+    params.update(kwargs)
+    return ConfidentLearningDetector(cleaner, **params)
+
+
+def test_detects_flipped_labels():
+    """Les labels inversés sont retrouvés avec une bonne précision"""
+    df, flipped = make_noisy_dataset(4000)
+    conflicts = make_detector().detect_mislabeled(df)
+
+    suspects = set(conflicts['index'])
+    flipped_index = set(df.index[flipped])
+    recall = len(suspects & flipped_index) / len(flipped_index)
+    precision = len(suspects & flipped_index) / len(suspects)
+    assert recall > 0.8, recall
+    assert precision > 0.5, precision
+
+
+def test_conflicts_schema():
+    """Même schéma que detect_mislabeled et suggestions tirées du modèle"""
+    df, _ = make_noisy_dataset(1500, seed=1)
+    detector = make_detector()
+    conflicts = detector.detect_mislabeled(df)
+
+    rule_columns = ['index', 'actual_label', 'text', 'polarity', 'subjectivity',
+                    'textblob_prediction', 'keyword_prediction', 'negative_keywords',
+                    'positive_keywords', 'conflict_reason', 'confidence_score']
+    assert list(conflicts.columns[:len(rule_columns)]) == rule_columns
+    assert conflicts['confidence_score'].is_monotonic_decreasing
+    assert (conflicts['model_prediction'] != conflicts['actual_label']).all()
+    for _, row in conflicts.head(20).iterrows():
+        assert df.loc[row['index'], 'combined_text'].startswith(row['text'].rstrip('.'))
+
+    suggestions = detector.cleaner.suggest_corrections(conflicts, top_n=5)
+    assert len(suggestions) == 5
+
+    # Label suggéré : prédiction du modèle, jamais le label actuel
+    suggestions = detector.cleaner.suggest_corrections(conflicts, top_n=len(conflicts))
+    assert len(suggestions) == len(conflicts)
+    for suggestion, (_, row) in zip(suggestions, conflicts.iterrows()):
+        assert suggestion['suggested_label'] == row['model_prediction']
+        assert suggestion['suggested_label'] != suggestion['current_label']
+
+
+def test_chunk_iterator_input():
+    """Un itérateur de chunks (ex. Dataset.iter) donne les mêmes suspects"""
+    df, _ = make_noisy_dataset(1500, seed=2)
+    expected = make_detector().detect_mislabeled(df)
+
+    def batches():
+        for start in range(0, len(df), 500):
+            yield {column: df[column].iloc[start:start + 500].tolist() for column in df.columns}
+
+    conflicts = make_detector().detect_mislabeled(batches)
+    assert conflicts['index'].tolist() == expected['index'].tolist()
+    np.testing.assert_allclose(conflicts['confidence_score'], expected['confidence_score'])
+
+
+def test_classes_in_any_order():
+    """Des classes passées dans le désordre donnent les mêmes suspects"""
+    df, _ = make_noisy_dataset(1500, seed=3)
+    expected = make_detector().detect_mislabeled(df)
+
+    detector = make_detector(classes=(1, 0))
+    conflicts = detector.detect_mislabeled(df)
+    assert detector.classes.tolist() == [0, 1]
+    assert conflicts['index'].tolist() == expected['index'].tolist()
+    assert conflicts['model_prediction'].tolist() == expected['model_prediction'].tolist()
+
+
+def benchmark_confident_learning(n_samples=200000, full_size=3600000):
+    """Débit sur des avis de ~75 mots et extrapolation au split train complet"""
+    df, _ = make_noisy_dataset(n_samples, words_per_review=75)
+    detector = ConfidentLearningDetector(LabelCleaner(sentiment_backend='fast'))
+
+    start = time.perf_counter()
+    conflicts = detector.detect_mislabeled(df)
+    elapsed = time.perf_counter() - start
+
+    print(f"   {n_samples:,} avis en {elapsed:.1f}s ({n_samples / elapsed:,.0f} avis/s, "
+          f"{len(conflicts):,} suspects)")
+    print(f"   Extrapolation {full_size:,} avis : {full_size / n_samples * elapsed / 60:.1f} min")
+
+
+def main():
+    """Lance les tests puis le benchmark"""
+    print("🧪 TESTS DU CONFIDENT LEARNING")
+    print("=" * 60)
+
+    test_detects_flipped_labels()
+    print("✅ Labels inversés retrouvés")
+
+    test_conflicts_schema()
+    print("✅ Schéma de detect_mislabeled")
+
+    test_chunk_iterator_input()
+    print("✅ Itérateur de chunks")
+
+    test_classes_in_any_order()
+    print("✅ Classes dans n'importe quel ordre")
+
+    print("\n⚡ BENCHMARK")
+    benchmark_confident_learning()
+
+
+if __name__ == "__main__":
+    main()
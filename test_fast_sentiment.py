@@ -0,0 +1,138 @@
+"""
+Tests et benchmark du moteur de sentiment rapide (sentiment_backend='fast')
+"""
+
+import sys
+import time
+import random
+sys.path.append('src')
+
+from textblob import TextBlob
+
+from src.label_cleaner import LabelCleaner
+from src.text_preprocessor import AdvancedTextPreprocessor, FastSentimentScorer
+from test_preprocess_batch import make_reviews
+
+# Écart maximal toléré avec TextBlob (mêmes données, même algorithme)
+TOLERANCE = 1e-9
+
+SENTIMENT_TEXTS = [
+    "",
+    "   ",
+    "I do not like this at all. Not good, really not good!",
+    "Very very good product, highly recommended :) would buy again",
+    "The worst purchase ever!!! Never again. Totally useless and cheap.",
+    "Not bad at all, actually pretty decent for the price.",
+    "It was okay I guess, nothing special but it works (!)",
+    "Absolutely wonderful. My wife loves it <3",
+    "I can't say it's great but it isn't terrible either.",
+    "Doesn't work. Don't waste your money, seriously disappointing :-(",
+    "Terribly slow, horribly loud... extremely happy to return it ;)",
+    "GREAT!!! Best. Thing. Ever. xD",
+    "no", "not", "never good", "really not bad", "very",
+]
+
+FUZZ_VOCABULARY = [
+    'good', 'bad', 'great', 'terrible', 'happy', 'sad', 'nice', 'awful',
+    'very', 'really', 'extremely', 'slightly', 'not', 'no', 'never', "n't",
+    "don't", 'is', 'a', 'the', 'it', 'product', 'was', 'an', 'so',
+    '!', '!!!', '.', ',', '?', '(!)', ':)', ':-(', '<3', ';)', ':D', "'",
+    'Terribly', 'GOOD', 'horribly', 'perfectly', 'broken', 'love', 'hate',
+]
+
+
+def raises_value_error(function, *args, **kwargs):
+    """Vrai si l'appel lève une ValueError"""
+    try:
+        function(*args, **kwargs)
+    except ValueError:
+        return True
+    return False
+
+
+def make_fuzz_texts(n_texts, seed=0):
+    """Textes aléatoires riches en négations, modificateurs et émoticônes"""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(FUZZ_VOCABULARY) for _ in range(rng.randint(1, 25)))
+            for _ in range(n_texts)]
+
+
+def test_fast_scorer_matches_textblob():
+    """Même polarité et subjectivité que TextBlob"""
+    scorer = FastSentimentScorer()
+
+    for text in SENTIMENT_TEXTS + make_reviews(14) + make_fuzz_texts(2000):
+        expected = TextBlob(text).sentiment
+        polarity, subjectivity = scorer(text)
+        assert abs(polarity - expected.polarity) <= TOLERANCE, text
+        assert abs(subjectivity - expected.subjectivity) <= TOLERANCE, text
+
+
+def test_preprocessor_backend():
+    """analyze_sentiment donne le même résultat avec les deux moteurs"""
+    textblob_preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    fast_preprocessor = AdvancedTextPreprocessor(use_spacy=False, sentiment_backend='fast')
+
+    assert textblob_preprocessor.sentiment_backend == 'textblob'
+    for text in SENTIMENT_TEXTS + [None]:
+        expected = textblob_preprocessor.analyze_sentiment(text)
+        result = fast_preprocessor.analyze_sentiment(text)
+        assert result['predicted_label'] == expected['predicted_label']
+        assert abs(result['polarity'] - expected['polarity']) <= TOLERANCE
+
+    assert raises_value_error(AdvancedTextPreprocessor, use_spacy=False, sentiment_backend='vader')
+
+
+def test_label_cleaner_backend():
+    """Le LabelCleaner choisit le preprocesseur partagé du moteur demandé"""
+    cleaner = LabelCleaner(sentiment_backend='fast')
+    assert cleaner.preprocessor.sentiment_backend == 'fast'
+    assert LabelCleaner().preprocessor.sentiment_backend == 'textblob'
+
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False, sentiment_backend='fast')
+    assert LabelCleaner(preprocessor=preprocessor).sentiment_backend == 'fast'
+
+    assert raises_value_error(LabelCleaner, preprocessor=preprocessor, sentiment_backend='textblob')
+    assert raises_value_error(LabelCleaner, sentiment_backend='vader')
+
+
+def benchmark_sentiment_backends(n_reviews=100000):
+    """Compare le débit de TextBlob et du moteur rapide"""
+    reviews = make_reviews(n_reviews)
+    scorer = FastSentimentScorer()
+
+    start = time.perf_counter()
+    for review in reviews:
+        TextBlob(review).sentiment
+    textblob_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for review in reviews:
+        scorer(review)
+    fast_time = time.perf_counter() - start
+
+    print(f"   TextBlob : {n_reviews / textblob_time:,.0f} avis/s ({textblob_time:.1f}s)")
+    print(f"   Rapide   : {n_reviews / fast_time:,.0f} avis/s ({fast_time:.1f}s) "
+          f"| x{textblob_time / fast_time:.2f}")
+
+
+def main():
+    """Lance les tests puis le benchmark"""
+    print("🧪 TESTS DU MOTEUR DE SENTIMENT RAPIDE")
+    print("=" * 60)
+
+    test_fast_scorer_matches_textblob()
+    print("✅ Scores identiques à TextBlob")
+
+    test_preprocessor_backend()
+    print("✅ sentiment_backend du preprocesseur")
+
+    test_label_cleaner_backend()
+    print("✅ sentiment_backend du LabelCleaner")
+
+    print("\n⚡ BENCHMARK (100k avis)")
+    benchmark_sentiment_backends()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Tests de l'extraction de features vectorisée (extract_features_batch)
+"""
+
+import sys
+import time
+sys.path.append('src')
+
+import numpy as np
+import pandas as pd
+
+from src.text_preprocessor import AdvancedTextPreprocessor
+
+FEATURE_TEXTS = [
+    "This is AMAZING!!! I can't believe it's so good. Check https://example.com",
+    "Terrible product :( Don't buy it! Contact support@company.com",
+    "",
+    "   ",
+    "one",
+    "ÉCOLE Naïve Über. Hello-World I'M ok? Yes, Sir.",
+    "Tabs\tand\nnew lines, here... and there?!",
+    "LOVE IT!!! 😍😍😍 #awesome #great @company",
+]
+
+
+def test_extract_features_batch_parity():
+    """Mêmes valeurs et colonnes que extract_features document par document"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+
+    batch_df = preprocessor.extract_features_batch(FEATURE_TEXTS)
+    expected_df = pd.DataFrame([preprocessor.extract_features(text) for text in FEATURE_TEXTS])
+
+    assert list(batch_df.columns) == list(expected_df.columns)
+    for column in expected_df.columns:
+        np.testing.assert_allclose(batch_df[column].to_numpy(dtype=float),
+                                   expected_df[column].to_numpy(dtype=float),
+                                   rtol=1e-6, atol=1e-6, err_msg=column)
+
+
+def test_extract_features_batch_dtypes_and_index():
+    """Colonnes compactes (int32/float32) et index de la Series conservé"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    texts = pd.Series(FEATURE_TEXTS[:3] + [None], index=[10, 20, 30, 40])
+
+    features_df = preprocessor.extract_features_batch(texts)
+
+    assert list(features_df.index) == [10, 20, 30, 40]
+    assert features_df['word_count'].dtype == np.int32
+    assert features_df['upper_case_ratio'].dtype == np.float32
+    assert features_df.loc[40, 'text_length'] == 0
+
+
+def test_feature_set_selection():
+    """feature_set limite les colonnes calculées, par groupe ou par nom"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    text = FEATURE_TEXTS[0]
+
+    surface = preprocessor.extract_features(text, feature_set='surface')
+    assert 'polarity' not in surface and 'sentence_count' not in surface
+    assert surface['exclamation_count'] == 3
+
+    selected = ['polarity', 'word_count', 'lexical']
+    features = preprocessor.extract_features(text, feature_set=selected)
+    assert list(features) == ['word_count', 'sentence_count', 'polarity', 'unique_word_ratio']
+
+    batch_df = preprocessor.extract_features_batch(FEATURE_TEXTS, feature_set=selected)
+    assert list(batch_df.columns) == list(features)
+    expected_df = pd.DataFrame([preprocessor.extract_features(t, feature_set=selected) for t in FEATURE_TEXTS])
+    np.testing.assert_allclose(batch_df.to_numpy(dtype=float), expected_df.to_numpy(dtype=float), atol=1e-6)
+
+    # Sans spaCy, le groupe spaCy ne produit aucune colonne
+    assert preprocessor.extract_features(text, feature_set='spacy') == {}
+
+
+def test_feature_set_unknown_name():
+    """Un groupe ou une feature inconnu lève une ValueError"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+
+    try:
+        preprocessor.extract_features_batch(FEATURE_TEXTS, feature_set=['surface', 'emotions'])
+        raised = False
+    except ValueError:
+        raised = True
+    assert raised
+
+
+def benchmark_surface_features(n_texts=20000):
+    """Compare extract_features document par document et extract_features_batch"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    texts = [FEATURE_TEXTS[i % len(FEATURE_TEXTS)] + f" (review {i})" for i in range(n_texts)]
+
+    start = time.perf_counter()
+    for text in texts:
+        preprocessor.extract_features(text)
+    per_document_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preprocessor.extract_features_batch(texts)
+    batch_time = time.perf_counter() - start
+
+    print(f"⚡ {n_texts:,} textes: {per_document_time:.2f}s par document, "
+          f"{batch_time:.2f}s en batch (x{per_document_time / batch_time:.2f})")
+
+
+def main():
+    """Lance les tests puis le benchmark"""
+    print("🧪 TESTS DE L'EXTRACTION DE FEATURES")
+    print("=" * 60)
+
+    test_extract_features_batch_parity()
+    print("✅ Parité avec extract_features")
+
+    test_extract_features_batch_dtypes_and_index()
+    print("✅ Types compacts et index")
+
+    test_feature_set_selection()
+    test_feature_set_unknown_name()
+    print("✅ Sélection des groupes de features")
+
+    benchmark_surface_features()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Tests du nettoyeur de labels (LabelCleaner)
+"""
+
+import sys
+import time
+import random
+sys.path.append('src')
+
+import numpy as np
+import pandas as pd
+
+import src.label_cleaner as label_cleaner_module
+from src.label_cleaner import LabelCleaner, KeywordMatcher, StreamingSuspectRanker
+from src.text_preprocessor import AdvancedTextPreprocessor, get_shared_preprocessor
+from test_preprocess_batch import make_reviews
+
+KEYWORD_TEXTS = [
+    "This badge is poorly made, it stopped working. Bad, BAD product!",
+    "Doesn't work at all, total waste. I regret it, what a disaster.",
+    "Amazing and excellent, I love it, would recommend; best purchase, happy.",
+    "",
+    "Not working... not working! Trash. Garbage.",
+    "The lovely, greatest thing (bestseller) impressed me",
+]
+
+
+def test_injected_preprocessor_is_reused():
+    """Un preprocesseur injecté est utilisé tel quel"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    cleaner = LabelCleaner(preprocessor=preprocessor)
+
+    assert cleaner.preprocessor is preprocessor
+
+
+def test_shared_preprocessor_is_lazy():
+    """Sans injection, le preprocesseur partagé n'est obtenu qu'à la première utilisation"""
+    cleaner = LabelCleaner()
+    assert cleaner._preprocessor is None
+
+    other = LabelCleaner()
+    assert cleaner.preprocessor is other.preprocessor
+    assert cleaner.preprocessor.use_spacy is False
+
+
+def test_with_stopwords_keeps_shared_instance():
+    """with_stopwords sur le preprocesseur partagé ne modifie pas l'instance partagée"""
+    shared = get_shared_preprocessor()
+    stop_words = shared.stop_words
+
+    custom = shared.with_stopwords(['seller'])
+
+    assert custom is not shared
+    assert get_shared_preprocessor() is shared
+    assert shared.stop_words is stop_words
+    assert 'seller' not in shared.stop_words
+    assert 'seller' in shared.remove_stopwords(['seller'])
+    assert custom.remove_stopwords(['seller']) == []
+
+
+def test_keyword_matcher_substring_parity():
+    """Mêmes comptes que la recherche de sous-chaînes mot-clé par mot-clé"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+
+    for text in KEYWORD_TEXTS + make_reviews(14):
+        text_lower = text.lower()
+        analysis = cleaner.analyze_keywords(text)
+        assert analysis['negative_keywords'] == sum(1 for word in cleaner.negative_keywords if word in text_lower)
+        assert analysis['positive_keywords'] == sum(1 for word in cleaner.positive_keywords if word in text_lower)
+
+
+def test_keyword_matcher_word_boundaries_and_phrases():
+    """Mots entiers, expressions et comptes par mot-clé"""
+    matcher = KeywordMatcher(['bad', 'poor', 'stopped working', 'not working'], word_boundaries=True)
+
+    hits = matcher.count(KEYWORD_TEXTS[0])
+    assert hits == {'bad': 2, 'stopped working': 1}
+    assert matcher.count(KEYWORD_TEXTS[4]) == {'not working': 2}
+
+    substring_hits = KeywordMatcher(['bad', 'poor'], word_boundaries=False).count(KEYWORD_TEXTS[0])
+    assert substring_hits == {'bad': 3, 'poor': 1}
+
+    assert KeywordMatcher([]).count("anything") == {}
+
+
+def test_keyword_matcher_without_ahocorasick():
+    """Sans pyahocorasick, les résultats sont identiques"""
+    keywords = ['bad', 'poor', 'stopped working', 'love', 'best']
+    matchers = {word_boundaries: KeywordMatcher(keywords, word_boundaries)
+                for word_boundaries in (False, True)}
+
+    automaton_module = label_cleaner_module.ahocorasick
+    label_cleaner_module.ahocorasick = None
+    try:
+        fallback = {word_boundaries: KeywordMatcher(keywords, word_boundaries)
+                    for word_boundaries in (False, True)}
+    finally:
+        label_cleaner_module.ahocorasick = automaton_module
+
+    for text in KEYWORD_TEXTS:
+        for word_boundaries in (False, True):
+            assert matchers[word_boundaries].count(text) == fallback[word_boundaries].count(text)
+
+
+def test_analyze_keywords_hits():
+    """Détail des occurrences et option mots entiers du LabelCleaner"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False),
+                           keyword_word_boundaries=True)
+
+    analysis = cleaner.analyze_keywords(KEYWORD_TEXTS[0], return_hits=True)
+    assert analysis['negative_hits'] == {'bad': 2, 'stopped working': 1}
+    assert analysis['negative_keywords'] == 2
+    assert analysis['positive_hits'] == {}
+
+    # Réaffecter les mots-clés (ensembles figés) reconstruit le matcher
+    assert isinstance(cleaner.negative_keywords, frozenset)
+    cleaner.negative_keywords = cleaner.negative_keywords | {'badge'}
+    assert cleaner.analyze_keywords(KEYWORD_TEXTS[0])['negative_keywords'] == 3
+    cleaner.negative_keywords = cleaner.negative_keywords - {'bad'}
+    assert cleaner.analyze_keywords(KEYWORD_TEXTS[0], return_hits=True)['negative_hits'] == {
+        'badge': 1, 'stopped working': 1}
+
+    # Idem pour l'option mots entiers
+    cleaner.keyword_word_boundaries = False
+    assert cleaner.analyze_keywords(KEYWORD_TEXTS[0], return_hits=True)['negative_hits']['badge'] == 1
+    assert 'poor' in cleaner.analyze_keywords(KEYWORD_TEXTS[0], return_hits=True)['negative_hits']
+
+
+def legacy_analyze_keywords(cleaner, text):
+    """Implémentation de référence : une recherche de sous-chaîne par mot-clé"""
+    text_lower = text.lower()
+    neg_count = sum(1 for word in cleaner.negative_keywords if word in text_lower)
+    pos_count = sum(1 for word in cleaner.positive_keywords if word in text_lower)
+    keyword_score = pos_count - neg_count
+    return {
+        'negative_keywords': neg_count,
+        'positive_keywords': pos_count,
+        'keyword_score': keyword_score,
+        'predicted_label': 1 if keyword_score > 0 else 0
+    }
+
+
+def best_time(function, texts, repeats=7):
+    """Meilleur temps (s) de function sur tous les textes"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in texts:
+            function(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_analyze_keywords_not_slower_than_legacy():
+    """Le matcher (sans vérification coûteuse par appel) n'est pas plus lent que la boucle d'origine"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+    short_texts = make_reviews(2000)
+    for texts in (short_texts, [text * 10 for text in short_texts[:500]]):
+        for text in texts[:50]:
+            assert cleaner.analyze_keywords(text) == legacy_analyze_keywords(cleaner, text)
+
+        matcher_time = best_time(cleaner.analyze_keywords, texts)
+        legacy_time = best_time(lambda text: legacy_analyze_keywords(cleaner, text), texts)
+        # Marge large contre le bruit de mesure ; l'ancienne vérification coûtait ~1.3x
+        assert matcher_time < legacy_time * 1.1, (matcher_time, legacy_time)
+
+
+def legacy_detect_mislabeled(cleaner, df, text_column='combined_text',
+                             label_column='label', threshold=0.3):
+    """Implémentation de référence ligne par ligne (iterrows)"""
+    results = []
+    for idx, row in df.iterrows():
+        text = row[text_column]
+        actual_label = row[label_column]
+        textblob_analysis = cleaner.analyze_sentiment_textblob(text)
+        keyword_analysis = cleaner.analyze_keywords(text)
+        polarity = textblob_analysis['polarity']
+        is_conflict = False
+        conflict_reason = ""
+        if actual_label == 1 and polarity < -threshold:
+            is_conflict = True
+            conflict_reason = f"Label positif mais polarité négative ({polarity:.3f})"
+        elif actual_label == 0 and polarity > threshold:
+            is_conflict = True
+            conflict_reason = f"Label négatif mais polarité positive ({polarity:.3f})"
+        if actual_label == 1 and keyword_analysis['negative_keywords'] > keyword_analysis['positive_keywords']:
+            if keyword_analysis['negative_keywords'] >= 2:
+                is_conflict = True
+                conflict_reason += f" + {keyword_analysis['negative_keywords']} mots négatifs forts"
+        if is_conflict:
+            results.append({
+                'index': idx,
+                'actual_label': actual_label,
+                'text': text[:200] + "..." if len(text) > 200 else text,
+                'polarity': polarity,
+                'subjectivity': textblob_analysis['subjectivity'],
+                'textblob_prediction': textblob_analysis['predicted_label'],
+                'keyword_prediction': keyword_analysis['predicted_label'],
+                'negative_keywords': keyword_analysis['negative_keywords'],
+                'positive_keywords': keyword_analysis['positive_keywords'],
+                'conflict_reason': conflict_reason,
+                'confidence_score': abs(polarity)
+            })
+    conflicts_df = pd.DataFrame(results)
+    if len(conflicts_df) > 0:
+        conflicts_df = conflicts_df.sort_values('confidence_score', ascending=False)
+    return conflicts_df
+
+
+def make_labeled_reviews(n_reviews, seed=0):
+    """Avis avec labels aléatoires et index non contigu"""
+    rng = random.Random(seed)
+    texts = KEYWORD_TEXTS[:3] + KEYWORD_TEXTS[4:] + make_reviews(20)
+    texts.append("Terrible, awful, horrible and broken. " * 10)
+    combined = [rng.choice(texts) for _ in range(n_reviews)]
+    return pd.DataFrame({
+        'combined_text': combined,
+        'label': [rng.randint(0, 1) for _ in range(n_reviews)]
+    }, index=rng.sample(range(10 * n_reviews), n_reviews))
+
+
+def test_detect_mislabeled_parity():
+    """Mêmes conflits, colonnes, types et ordre que l'implémentation ligne par ligne"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+    df = make_labeled_reviews(300)
+
+    expected = legacy_detect_mislabeled(cleaner, df)
+    for batch_size in (100000, 7):
+        conflicts = cleaner.detect_mislabeled(df, batch_size=batch_size)
+        pd.testing.assert_frame_equal(conflicts, expected)
+
+    no_conflict_df = pd.DataFrame({'combined_text': ["It is a product."], 'label': [1]})
+    assert cleaner.detect_mislabeled(no_conflict_df).empty
+
+    # Brique publique : mêmes conflits, dans l'ordre des lignes
+    conflicts = cleaner.detect_conflicts(df['combined_text'], df['label'])
+    assert conflicts['index'].tolist() == [index for index in df.index if index in set(expected['index'])]
+    pd.testing.assert_frame_equal(
+        conflicts.sort_values('confidence_score', ascending=False), expected)
+
+
+def test_apply_corrections():
+    """Corrections en bloc : même résultat que ligne par ligne, sans modifier df"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+    df = make_labeled_reviews(200)
+    corrections = cleaner.suggest_corrections(cleaner.detect_mislabeled(df), top_n=50)
+    assert corrections
+
+    expected = df.copy()
+    for correction in corrections:
+        expected.loc[correction['index'], 'label'] = correction['suggested_label']
+
+    original = df.copy()
+    corrected = cleaner.apply_corrections(df, corrections)
+    assert isinstance(corrected, pd.DataFrame) and corrected is not df
+    pd.testing.assert_frame_equal(corrected, expected)
+    pd.testing.assert_frame_equal(cleaner.apply_corrections(df, pd.DataFrame(corrections)), expected)
+    pd.testing.assert_frame_equal(df, original)
+
+    new_labels = pd.Series([c['suggested_label'] for c in corrections], index=[c['index'] for c in corrections])
+    pd.testing.assert_frame_equal(cleaner.apply_corrections(df, new_labels), expected)
+
+    # Seule la colonne de labels est copiée
+    assert not np.shares_memory(corrected['label'].to_numpy(), df['label'].to_numpy())
+    assert np.shares_memory(corrected['combined_text'].to_numpy(), df['combined_text'].to_numpy())
+
+    # Aucune correction : colonne et type inchangés
+    pd.testing.assert_frame_equal(cleaner.apply_corrections(df, []), original)
+    assert cleaner.correction_audit(df, []).empty
+
+
+def test_apply_corrections_inplace_audit():
+    """Même résultat dans les deux modes ; journal séparé, calculé avant correction"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+    df = pd.DataFrame({'label': [0, 1, 1, 0]}, index=[10, 20, 30, 40])
+    corrections = [
+        {'index': 20, 'suggested_label': 0, 'confidence': 'Haute'},
+        {'index': 40, 'suggested_label': 1, 'confidence': 'Faible'},
+        {'index': 20, 'suggested_label': 1, 'confidence': 'Moyenne'},  # la dernière l'emporte
+        {'index': 99, 'suggested_label': 1, 'confidence': 'Haute'},    # index absent : ignoré
+    ]
+
+    copy_df = cleaner.apply_corrections(df, corrections)
+    assert df['label'].tolist() == [0, 1, 1, 0]
+
+    audit = cleaner.correction_audit(df, corrections)
+    corrected = cleaner.apply_corrections(df, corrections, inplace=True)
+
+    assert corrected is df
+    pd.testing.assert_frame_equal(copy_df, df)
+    assert df['label'].tolist() == [0, 1, 1, 1]
+    assert df['label'].dtype == 'int64'
+    assert list(audit.columns) == ['index', 'old_label', 'new_label', 'confidence']
+    assert audit.values.tolist() == [[20, 1, 1, 'Moyenne'], [40, 0, 1, 'Faible']]
+
+
+def test_streaming_top_suspects():
+    """Le classement streaming garde les top_n conflits de detect_mislabeled"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+    df = make_labeled_reviews(400).reset_index(drop=True)
+    all_conflicts = cleaner.detect_mislabeled(df)
+    top_n = 25
+
+    # Lots {colonne: valeurs} comme Dataset.iter(batch_size=...)
+    batches = ({column: df[column].iloc[start:start + 60].tolist() for column in df.columns}
+               for start in range(0, len(df), 60))
+    ranker = cleaner.detect_mislabeled_streaming(batches, split='train', top_n=top_n)
+    top_conflicts = ranker.top_conflicts()
+
+    assert len(ranker) == top_n
+    assert top_conflicts['confidence_score'].tolist() == all_conflicts['confidence_score'].head(top_n).tolist()
+    assert set(top_conflicts['index']) <= set(all_conflicts['index'])
+    assert (top_conflicts['split'] == 'train').all()
+    for _, row in top_conflicts.iterrows():
+        assert df.loc[row['index'], 'combined_text'].startswith(row['text'].rstrip('.'))
+    assert cleaner.suggest_corrections(top_conflicts, top_n=5)
+
+    counters = ranker.counters['train']
+    assert counters['samples'] == len(df)
+    assert counters['conflicts'] == len(all_conflicts)
+    assert counters['positive_label_conflicts'] == all_conflicts['conflict_reason'].str.startswith('Label positif').sum()
+    assert counters['negative_label_conflicts'] == all_conflicts['conflict_reason'].str.startswith('Label négatif').sum()
+    assert counters['keyword_conflicts'] == all_conflicts['conflict_reason'].str.contains('mots négatifs').sum()
+
+
+def test_streaming_splits_and_formats():
+    """Compteurs par split, échantillons title/content et tas borné"""
+    cleaner = LabelCleaner(preprocessor=AdvancedTextPreprocessor(use_spacy=False))
+    ranker = StreamingSuspectRanker(cleaner, top_n=3)
+
+    samples = [{'title': "Awful", 'content': "Terrible, horrible and broken.", 'label': 1}] * 5
+    assert ranker.update(samples, split='train') == 5
+    ranker.update(pd.DataFrame({'combined_text': ["Excellent, wonderful, perfect!"] * 2, 'label': [0, 1]}),
+                  split='test')
+
+    assert ranker.counters['train']['samples'] == 5
+    assert ranker.counters['test'] == {'samples': 2, 'conflicts': 1, 'positive_label_conflicts': 0,
+                                       'negative_label_conflicts': 1, 'keyword_conflicts': 0}
+    assert len(ranker) == 3
+    # Confiance 1.0 (test) puis 0.85 (train) : à égalité, les premiers arrivés
+    top_conflicts = ranker.top_conflicts()
+    assert list(zip(top_conflicts['split'], top_conflicts['index'])) == [('test', 0), ('train', 0), ('train', 1)]
+
+
+def main():
+    """Lance les tests du LabelCleaner"""
+    print("🧪 TESTS DU LABEL CLEANER")
+    print("=" * 60)
+
+    test_injected_preprocessor_is_reused()
+    print("✅ Preprocesseur injecté")
+
+    test_shared_preprocessor_is_lazy()
+    print("✅ Preprocesseur partagé paresseux")
+
+    test_with_stopwords_keeps_shared_instance()
+    print("✅ Preprocesseur partagé inchangé par with_stopwords")
+
+    test_keyword_matcher_substring_parity()
+    print("✅ Mots-clés : mêmes comptes que la recherche de sous-chaînes")
+
+    test_keyword_matcher_word_boundaries_and_phrases()
+    print("✅ Mots entiers, expressions et comptes par mot-clé")
+
+    test_keyword_matcher_without_ahocorasick()
+    print("✅ Repli sans pyahocorasick")
+
+    test_analyze_keywords_hits()
+    print("✅ Détail des occurrences")
+
+    test_analyze_keywords_not_slower_than_legacy()
+    print("✅ analyze_keywords pas plus lent que la boucle d'origine")
+
+    test_detect_mislabeled_parity()
+    print("✅ detect_mislabeled vectorisé identique")
+
+    test_apply_corrections()
+    print("✅ apply_corrections en bloc")
+
+    test_apply_corrections_inplace_audit()
+    print("✅ apply_corrections en place avec journal")
+
+    test_streaming_top_suspects()
+    print("✅ Classement streaming des suspects")
+
+    test_streaming_splits_and_formats()
+    print("✅ Compteurs par split et formats de chunks")
+
+
+if __name__ == "__main__":
+    main()
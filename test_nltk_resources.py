@@ -0,0 +1,125 @@
+"""
+Tests de la vérification des ressources NLTK
+"""
+
+import sys
+import tempfile
+sys.path.append('src')
+
+import nltk
+
+import src.massive_preprocessing_pipeline as pipeline_module
+import src.text_preprocessor as text_preprocessor
+from src.massive_preprocessing_pipeline import MassivePreprocessingPipeline
+from src.text_preprocessor import AdvancedTextPreprocessor, ensure_nltk_resources
+
+
+def test_resources_checked_once_per_process():
+    """Les ressources ne sont vérifiées qu'une fois par processus"""
+    AdvancedTextPreprocessor(use_spacy=False)
+
+    original_find = nltk.data.find
+    calls = []
+    nltk.data.find = lambda path: calls.append(path)
+    try:
+        AdvancedTextPreprocessor(use_spacy=False)
+        ensure_nltk_resources()
+    finally:
+        nltk.data.find = original_find
+
+    assert calls == []
+
+
+def test_resource_paths_use_categories():
+    """Chaque ressource est cherchée dans sa catégorie nltk_data"""
+    paths = text_preprocessor.NLTK_RESOURCES
+
+    assert paths['stopwords'] == 'corpora/stopwords'
+    assert paths['wordnet'] == 'corpora/wordnet'
+    assert paths[text_preprocessor.PUNKT_RESOURCE].startswith('tokenizers/')
+
+
+def test_offline_mode_fails_fast():
+    """En mode offline, une ressource manquante lève une erreur sans téléchargement"""
+    def missing(path):
+        raise LookupError(path)
+
+    downloads = []
+    original_find, original_download = nltk.data.find, nltk.download
+    original_checked = text_preprocessor._nltk_resources_checked
+    nltk.data.find = missing
+    nltk.download = lambda *args, **kwargs: downloads.append(args)
+    text_preprocessor._nltk_resources_checked = False
+    try:
+        try:
+            ensure_nltk_resources(offline=True)
+            raised = False
+        except LookupError as e:
+            raised = True
+            assert 'stopwords' in str(e)
+    finally:
+        nltk.data.find, nltk.download = original_find, original_download
+        text_preprocessor._nltk_resources_checked = original_checked
+
+    assert raised
+    assert downloads == []
+
+
+def test_offline_mode_reaches_pipeline_workers():
+    """offline suit le pipeline jusqu'au preprocesseur partagé des workers"""
+    def missing(path):
+        raise LookupError(path)
+
+    # Module text_preprocessor importé par le pipeline (registre et vérification NLTK)
+    shared_module = sys.modules[pipeline_module.get_shared_preprocessor.__module__]
+
+    downloads = []
+    original_find, original_download = nltk.data.find, nltk.download
+    original_checked = shared_module._nltk_resources_checked
+    nltk.data.find = missing
+    nltk.download = lambda *args, **kwargs: downloads.append(args)
+    shared_module._nltk_resources_checked = False
+    try:
+        try:
+            with tempfile.TemporaryDirectory() as output_dir:
+                MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False, offline=True)
+            raised = False
+        except LookupError:
+            raised = True
+    finally:
+        nltk.data.find, nltk.download = original_find, original_download
+        shared_module._nltk_resources_checked = original_checked
+
+    assert raised
+    assert downloads == []
+
+    # Ressources présentes : preprocesseur offline distinct, transmis aux workers
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False, offline=True)
+        assert pipeline.preprocessor.offline
+        assert pipeline.preprocessor is not pipeline_module.get_shared_preprocessor()
+        assert pipeline.worker_config()['offline'] is True
+        pipeline_module._init_worker(pipeline.worker_config())
+        assert pipeline_module._worker_pipeline.preprocessor is pipeline.preprocessor
+
+
+def main():
+    """Lance les tests des ressources NLTK"""
+    print("🧪 TESTS DES RESSOURCES NLTK")
+    print("=" * 60)
+
+    test_resources_checked_once_per_process()
+    print("✅ Vérification unique par processus")
+
+    test_resource_paths_use_categories()
+    print("✅ Chemins par catégorie")
+
+    test_offline_mode_fails_fast()
+    print("✅ Mode offline")
+
+    test_offline_mode_reaches_pipeline_workers()
+    print("✅ Mode offline transmis aux workers du pipeline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Tests du post-traitement fusionné des tokens (postprocess_tokens)
+"""
+
+import itertools
+import sys
+sys.path.append('src')
+
+from src.text_preprocessor import AdvancedTextPreprocessor
+
+TOKENS = ["The", "dogs", "were", "running", "a", "i", "x", "!", "42", "geese",
+          "wasn't", "better", "Batteries", "supercalifragilisticexpialidocious" * 2,
+          "n't", "it", "cats", "was", "leaves"]
+
+
+def staged_postprocess(preprocessor, tokens, remove_stopwords, lemmatize, stem, filter_tokens):
+    """Enchaînement historique des étapes séparées"""
+    if remove_stopwords:
+        tokens = preprocessor.remove_stopwords(tokens)
+    if lemmatize:
+        tokens = preprocessor.lemmatize(tokens)
+    if stem:
+        tokens = preprocessor.stem(tokens)
+    if filter_tokens:
+        tokens = preprocessor.filter_tokens(tokens)
+    return tokens
+
+
+def test_postprocess_tokens_matches_stages():
+    """La passe fusionnée équivaut aux étapes séparées pour toutes les options"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    lowercased_tokens = [token.lower() for token in TOKENS]
+
+    for options in itertools.product([True, False], repeat=4):
+        expected = staged_postprocess(preprocessor, TOKENS, *options)
+        remove_stopwords, lemmatize, stem, filter_tokens = options
+        kwargs = {'remove_stopwords': remove_stopwords, 'lemmatize': lemmatize,
+                  'stem': stem, 'filter_tokens': filter_tokens}
+
+        assert preprocessor.postprocess_tokens(TOKENS, **kwargs) == expected, options
+        assert (preprocessor.postprocess_tokens(lowercased_tokens, lowercased=True, **kwargs) ==
+                staged_postprocess(preprocessor, lowercased_tokens, *options)), options
+
+
+def test_postprocess_tokens_filter_options():
+    """Les options de filtrage sont celles de filter_tokens"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    options = {'min_length': 1, 'max_length': 5, 'keep_alpha_only': False, 'remove_single_chars': False}
+
+    expected = preprocessor.filter_tokens(TOKENS, **options)
+    assert preprocessor.postprocess_tokens(TOKENS, remove_stopwords=False, lemmatize=False, **options) == expected
+
+
+def main():
+    """Lance les tests du post-traitement fusionné"""
+    print("🧪 TESTS DU POST-TRAITEMENT FUSIONNÉ")
+    print("=" * 60)
+
+    test_postprocess_tokens_matches_stages()
+    print("✅ Équivalence avec les étapes séparées")
+
+    test_postprocess_tokens_filter_options()
+    print("✅ Options de filtrage")
+
+
+if __name__ == "__main__":
+    main()
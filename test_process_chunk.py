@@ -0,0 +1,473 @@
+"""
+Tests du traitement d'un chunk par le pipeline massif (process_chunk)
+"""
+
+import sys
+import json
+import time
+import pickle
+import tempfile
+import tracemalloc
+from pathlib import Path
+sys.path.append('src')
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from datasets import Dataset
+from textblob import TextBlob
+
+from src.massive_preprocessing_pipeline import (
+    MassivePreprocessingPipeline, file_checksum, load_chunk, sample_costs
+)
+from src.label_cleaner import LabelCleaner
+from src.text_preprocessor import AdvancedTextPreprocessor
+from test_preprocess_batch import make_reviews
+
+
+def make_chunk(n_samples):
+    """Génère un chunk d'échantillons au format Amazon Polarity"""
+    return [{'title': f"Title {i}", 'content': review, 'label': i % 2}
+            for i, review in enumerate(make_reviews(n_samples))]
+
+
+def make_pipeline(output_dir):
+    """Pipeline sans multiprocessing écrivant dans output_dir"""
+    return MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False)
+
+
+def test_sentiment_computed_once_per_document():
+    """Chaque document n'est analysé par TextBlob qu'une seule fois"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = make_pipeline(output_dir)
+        chunk = make_chunk(25)
+
+        before = pipeline.preprocessor.sentiment_evaluations
+        chunk_result = pipeline.process_chunk(chunk, chunk_id=0)
+
+        assert chunk_result['processed_count'] == len(chunk)
+        assert pipeline.preprocessor.sentiment_evaluations - before == len(chunk)
+
+
+def test_shared_sentiment_values():
+    """Les features et la détection de labels utilisent la polarité TextBlob"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = make_pipeline(output_dir)
+        chunk_result = pipeline.process_chunk(make_chunk(14), chunk_id=0)
+
+        for result in chunk_result['table'].to_pylist():
+            sentiment = TextBlob(result['combined_text']).sentiment
+            assert abs(result['polarity'] - sentiment.polarity) < 1e-6
+            assert abs(result['subjectivity'] - sentiment.subjectivity) < 1e-6
+            assert result['confidence_score'] == abs(sentiment.polarity)
+
+
+def test_pool_matches_sequential_and_merges_stats():
+    """Workers initialisés une fois : mêmes résultats et statistiques fusionnées"""
+    chunk = make_chunk(30)
+    with tempfile.TemporaryDirectory() as output_dir:
+        sequential = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                                  chunk_size=8)
+        expected_df = sequential.process_dataset_split(chunk, 'test')
+
+        parallel = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=True,
+                                                n_workers=2, chunk_size=8)
+        parallel_df = parallel.process_dataset_split(chunk, 'test')
+
+    assert parallel_df.equals(expected_df)
+    for pipeline in (sequential, parallel):
+        assert pipeline.stats['total_processed'] == len(chunk)
+        assert pipeline.stats['chunks_processed'] == 4
+        assert pipeline.stats['errors_detected'] == int(expected_df['is_label_suspect'].sum())
+        assert pipeline.stats['sentiment_evaluations'] == len(chunk)
+
+
+def test_worker_task_payload():
+    """Les tâches soumises au pool ne contiennent ni le pipeline ni les échantillons"""
+    chunk = make_chunk(30)
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=True,
+                                                n_workers=2, chunk_size=8)
+        submitted = []
+        chunk_task = pipeline.chunk_task
+        pipeline.chunk_task = lambda *args: (submitted.append(chunk_task(*args)), submitted[-1])[1]
+        pipeline.process_dataset_split(chunk, 'test')
+
+    assert sorted(args for _, args in submitted) == [(0, 8, 0, 'test'), (8, 16, 1, 'test'),
+                                                     (16, 24, 2, 'test'), (24, 30, 3, 'test')]
+    # Taille indépendante de celle du chunk : fonction (par nom) et 4 scalaires
+    for task in submitted:
+        assert len(pickle.dumps(task)) < 200
+
+
+class NoIterationSplit(list):
+    """Split qui interdit sa conversion complète en liste"""
+
+    def __iter__(self):
+        raise AssertionError("le split ne doit pas être matérialisé")
+
+
+def test_lazy_chunk_loading():
+    """Les chunks sont lus par plages d'index, sans matérialiser le split"""
+    samples = make_chunk(30)
+    dataset = Dataset.from_list(samples)
+
+    assert load_chunk(dataset, 8, 16) == samples[8:16]
+    assert load_chunk(samples, 24, 30) == samples[24:30]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                                chunk_size=8)
+        assert pipeline.chunk_ranges(30) == [(0, 8), (8, 16), (16, 24), (24, 30)]
+
+        expected_df = pipeline.process_dataset_split(samples, 'test')
+        assert pipeline.process_dataset_split(dataset, 'test').equals(expected_df)
+        assert pipeline.process_dataset_split(NoIterationSplit(samples), 'test').equals(expected_df)
+
+        parallel = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=True,
+                                                n_workers=2, chunk_size=8)
+        assert parallel.process_dataset_split(dataset, 'test').equals(expected_df)
+
+
+class FailingSplit(list):
+    """Split dont la lecture échoue à partir d'un index donné"""
+
+    def __init__(self, samples, fail_from):
+        super().__init__(samples)
+        self.fail_from = fail_from
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) and index.stop > self.fail_from:
+            raise RuntimeError("lecture interrompue")
+        return super().__getitem__(index)
+
+
+def test_chunks_written_incrementally():
+    """Un fichier Parquet par chunk, écrit dès que le chunk est traité"""
+    samples = make_chunk(30)
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                                chunk_size=8)
+        expected_df = pipeline.process_chunk(samples, chunk_id=0)['table'].to_pandas()
+
+        df = pipeline.process_dataset_split(samples, 'test')
+        split_dir = Path(output_dir) / "split=test"
+        assert sorted(path.name for path in split_dir.iterdir()) == [
+            f"part-0000{i}.parquet" for i in range(4)]
+        assert df.equals(expected_df)
+        assert pd.read_parquet(split_dir / "part-00003.parquet").equals(expected_df.iloc[24:].reset_index(drop=True))
+
+        # Vue paresseuse sur les fichiers
+        view = pipeline.process_dataset_split(samples, 'test', lazy=True)
+        assert isinstance(view, ds.Dataset)
+        assert view.count_rows() == len(samples)
+        assert view.to_table().to_pandas().equals(expected_df)
+
+        # Un nouveau traitement du split remplace les fichiers précédents
+        pipeline.chunk_size = 16
+        assert pipeline.process_dataset_split(samples, 'test').equals(expected_df)
+        assert len(list(split_dir.iterdir())) == 2
+
+        # Un arrêt en cours de split conserve les chunks déjà écrits
+        pipeline.chunk_size = 8
+        try:
+            pipeline.process_dataset_split(FailingSplit(samples, fail_from=20), 'test')
+        except RuntimeError:
+            pass
+        assert pipeline.load_processed_split('test').equals(expected_df.iloc[:16])
+
+
+def test_manifest_and_resume():
+    """Le manifeste enregistre chaque chunk ; resume=True ne traite que les manquants"""
+    samples = make_chunk(30)
+    with tempfile.TemporaryDirectory() as output_dir:
+        reference = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                                 chunk_size=8)
+        expected_df = reference.process_dataset_split(samples, 'test')
+
+        # Interruption pendant le chunk 2
+        interrupted = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                                   chunk_size=8)
+        try:
+            interrupted.process_dataset_split(FailingSplit(samples, fail_from=20), 'test')
+        except RuntimeError:
+            pass
+
+        manifest = json.loads((Path(output_dir) / "chunk_manifest.json").read_text())
+        entries = sorted(manifest['chunks'].values(), key=lambda entry: entry['chunk_id'])
+        assert [(entry['start'], entry['end'], entry['rows']) for entry in entries] == [(0, 8, 8), (8, 16, 8)]
+        assert entries[0]['output_file'] == "split=test/part-00000.parquet"
+        assert entries[0]['checksum'] == file_checksum(Path(output_dir) / entries[0]['output_file'])
+
+        # Reprise : seuls les chunks 2 et 3 sont traités
+        resumed = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                               chunk_size=8)
+        processed_chunks = []
+        process_chunk = resumed.process_chunk
+        resumed.process_chunk = lambda chunk_data, chunk_id: (processed_chunks.append(chunk_id),
+                                                              process_chunk(chunk_data, chunk_id))[1]
+        assert resumed.process_dataset_split(samples, 'test', resume=True).equals(expected_df)
+        assert processed_chunks == [2, 3]
+        assert resumed.stats['total_processed'] == len(samples)
+        assert resumed.stats['chunks_processed'] == 4
+        assert resumed.stats['sentiment_evaluations'] == len(samples)
+
+        # Un fichier modifié ne correspond plus à sa somme de contrôle : retraité
+        (Path(output_dir) / "split=test/part-00001.parquet").write_bytes(b"corrompu")
+        parallel = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=True,
+                                                n_workers=2, chunk_size=8)
+        before = parallel.preprocessor.sentiment_evaluations
+        assert parallel.process_dataset_split(samples, 'test', resume=True).equals(expected_df)
+        assert parallel.preprocessor.sentiment_evaluations - before == 8
+
+        # Un nouveau découpage invalide les chunks dont la plage a changé
+        rechunked = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                                 chunk_size=16)
+        before = rechunked.preprocessor.sentiment_evaluations
+        assert rechunked.process_dataset_split(samples, 'test', resume=True).equals(expected_df)
+        assert rechunked.preprocessor.sentiment_evaluations - before == len(samples)
+        assert len(rechunked.load_manifest()['chunks']) == 2
+
+
+def test_bounded_unordered_scheduling():
+    """Fenêtre de chunks bornée : même sortie, et une erreur de worker conserve les chunks finis"""
+    samples = make_chunk(30)
+    with tempfile.TemporaryDirectory() as output_dir:
+        expected_df = make_pipeline(output_dir).process_dataset_split(samples, 'test')
+
+        parallel = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=True,
+                                                n_workers=2, chunk_size=4, max_in_flight=3)
+        assert parallel.max_in_flight == 3
+        assert parallel.process_dataset_split(samples, 'test').equals(expected_df)
+        assert parallel.stats['chunks_processed'] == 8
+        assert len(parallel.load_manifest()['chunks']) == 8
+
+        # Un seul chunk en cours : les chunks 0 et 1 sont finis avant l'échec du chunk 2
+        failing = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=True,
+                                               n_workers=2, chunk_size=8, max_in_flight=1)
+        try:
+            failing.process_dataset_split(FailingSplit(samples, fail_from=20), 'test')
+            raised = False
+        except RuntimeError:
+            raised = True
+        assert raised
+        chunk_ids = sorted(entry['chunk_id'] for entry in failing.load_manifest()['chunks'].values())
+        assert chunk_ids == [0, 1]
+        assert failing.load_processed_split('test').equals(expected_df.iloc[:16])
+
+
+def make_uneven_chunk(n_samples):
+    """Chunk dont la seconde moitié contient des avis 20 fois plus longs"""
+    samples = make_chunk(n_samples)
+    for sample in samples[n_samples // 2:]:
+        sample['content'] = " ".join([sample['content']] * 20)
+    return samples
+
+
+def test_adaptive_chunking():
+    """Chunks de coût égal : moins d'échantillons là où les avis sont longs"""
+    samples = make_uneven_chunk(40)
+    costs = sample_costs(samples)
+    assert costs[0] == len(samples[0]['title']) + 1 + len(samples[0]['content']) + 64
+    assert (sample_costs(Dataset.from_list(samples), batch_size=7) == costs).all()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        fixed = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                             chunk_size=10)
+        expected_df = fixed.process_dataset_split(samples, 'test')
+
+        adaptive = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                                chunk_size=10, chunking='adaptive')
+        ranges = adaptive.plan_chunks(samples)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(samples)
+        assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+        assert len(ranges) == 4
+
+        # Chaque chunk dépasse la cible d'au plus un échantillon
+        chunk_costs = [costs[start:end].sum() for start, end in ranges]
+        assert max(chunk_costs) <= costs.sum() / len(ranges) + costs.max()
+        assert ranges[0][1] - ranges[0][0] > ranges[-1][1] - ranges[-1][0]
+
+        fixed_costs = [costs[start:end].sum() for start, end in fixed.plan_chunks(samples)]
+        assert max(chunk_costs) / np.mean(chunk_costs) < max(fixed_costs) / np.mean(fixed_costs)
+
+        # Même sortie que le découpage fixe, y compris avec le pool
+        assert adaptive.process_dataset_split(samples, 'test').equals(expected_df)
+        parallel = MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=True,
+                                                n_workers=2, chunk_size=10, chunking='adaptive')
+        assert parallel.process_dataset_split(Dataset.from_list(samples), 'test').equals(expected_df)
+
+        assert adaptive.adaptive_chunk_ranges(np.array([], dtype=np.int64)) == []
+        try:
+            MassivePreprocessingPipeline(output_dir=output_dir, chunking='dynamic')
+            raised = False
+        except ValueError:
+            raised = True
+        assert raised
+
+
+SUSPECT_SAMPLES = [
+    {'title': "Broken", 'content': "Awful, broken and a waste. Refund please.", 'label': 1},
+    {'title': "Love it", 'content': "Excellent, perfect and wonderful quality!", 'label': 0},
+    {'title': "Meh", 'content': "It broke, returned it, defective junk but great price", 'label': 1},
+    {'title': "Fine", 'content': "Works as described.", 'label': 1},
+]
+
+
+def per_sample_suspect(sample, pipeline):
+    """Règles de suspicion appliquées échantillon par échantillon (ancien process_chunk)"""
+    combined_text = sample['title'] + " " + sample['content']
+    polarity = pipeline.label_cleaner.analyze_sentiment_textblob(combined_text)['polarity']
+    negative_keywords = pipeline.label_cleaner.analyze_keywords(combined_text)['negative_keywords']
+    is_label_suspect, suspect_reason = False, ""
+    if sample['label'] == 1 and polarity < -0.3:
+        is_label_suspect, suspect_reason = True, f"Positif mais polarité {polarity:.3f}"
+    elif sample['label'] == 0 and polarity > 0.3:
+        is_label_suspect, suspect_reason = True, f"Négatif mais polarité {polarity:.3f}"
+    if sample['label'] == 1 and negative_keywords >= 2:
+        is_label_suspect = True
+        suspect_reason += f" + {negative_keywords} mots négatifs"
+    return is_label_suspect, suspect_reason
+
+
+def test_columnar_chunk_results():
+    """Table Arrow par chunk : mêmes valeurs que les règles échantillon par échantillon"""
+    # Échantillons invalides (texte manquant, label non entier) en fin de chunk : ignorés
+    invalid_samples = [{'title': None, 'content': "x", 'label': 1},
+                       {'title': "Title", 'content': "x", 'label': None},
+                       {'title': "Title", 'content': "x", 'label': "1"},
+                       {'title': "Title", 'content': "x", 'label': 0.5}]
+    valid_samples = make_chunk(40) + SUSPECT_SAMPLES + [{'title': "Title", 'content': "x", 'label': np.int64(0)}]
+    samples = valid_samples + invalid_samples
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = make_pipeline(output_dir)
+        chunk_result = pipeline.process_chunk(samples, chunk_id=0)
+
+        table = chunk_result['table']
+        assert isinstance(table, pa.Table)
+        assert table.num_rows == chunk_result['processed_count'] == len(valid_samples)
+        assert table.schema.field('label').type == pa.int64()
+        assert table.schema.field('title').type == pa.string()
+        assert table.schema.field('word_count').type == pa.int32()
+
+        rows = table.to_pylist()
+        assert sum(row['is_label_suspect'] for row in rows) >= len(SUSPECT_SAMPLES) - 1
+        for sample, row in zip(samples, rows):
+            combined_text = sample['title'] + " " + sample['content']
+            assert row['combined_text'] == combined_text
+            assert row['text_length'] == len(combined_text)
+            assert row['processed_length'] == len(row['processed_text'])
+            assert (row['is_label_suspect'], row['suspect_reason']) == per_sample_suspect(sample, pipeline)
+            expected_label = (pipeline.label_cleaner.analyze_sentiment_textblob(combined_text)['predicted_label']
+                              if row['is_label_suspect'] else sample['label'])
+            assert row['suggested_label'] == expected_label
+
+        empty = pipeline.process_chunk([], chunk_id=1)['table']
+        assert empty.num_rows == 0 and empty.schema == table.schema
+
+
+class FailingPreprocessor(AdvancedTextPreprocessor):
+    """Preprocesseur dont analyze_batch échoue sur tout lot contenant BOOM"""
+
+    def analyze_batch(self, texts, *args, **kwargs):
+        texts = list(texts)
+        if any("BOOM" in text for text in texts):
+            raise ValueError("document impossible à analyser")
+        return super().analyze_batch(texts, *args, **kwargs)
+
+
+def test_failing_document_skipped():
+    """Un document qui fait échouer analyze_batch n'est ignoré que lui, pas le chunk"""
+    samples = make_chunk(12)
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = make_pipeline(output_dir)
+        expected = pipeline.process_chunk(samples, chunk_id=0)['table']
+
+        pipeline.preprocessor = FailingPreprocessor(use_spacy=False)
+        pipeline.label_cleaner = LabelCleaner(preprocessor=pipeline.preprocessor)
+        bad_sample = {'title': "BOOM", 'content': "This one breaks the batch.", 'label': 1}
+        chunk_result = pipeline.process_chunk(samples[:5] + [bad_sample] + samples[5:], chunk_id=0)
+
+        assert chunk_result['processed_count'] == len(samples)
+        assert chunk_result['table'].to_pylist() == expected.to_pylist()
+
+        # Chunk entièrement fautif : table vide au bon schéma
+        empty = pipeline.process_chunk([bad_sample], chunk_id=1)['table']
+        assert empty.num_rows == 0 and empty.schema == expected.schema
+
+
+def benchmark_columnar_results(n_samples=20000):
+    """Mémoire, taille IPC et concaténation : dictionnaires par échantillon vs table Arrow"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = make_pipeline(output_dir)
+        table = pipeline.process_chunk(make_chunk(n_samples), chunk_id=0)['table']
+
+    # Ancien format : un dictionnaire de 20 clés par échantillon
+    tracemalloc.start()
+    records = table.to_pylist()
+    records_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    records_pickle = len(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+    table_pickle = len(pickle.dumps(table, protocol=pickle.HIGHEST_PROTOCOL))
+
+    chunks = [records[start:start + 2000] for start in range(0, n_samples, 2000)]
+    start = time.perf_counter()
+    pd.DataFrame([record for chunk in chunks for record in chunk])
+    records_time = time.perf_counter() - start
+    tables = [table.slice(start, 2000) for start in range(0, n_samples, 2000)]
+    start = time.perf_counter()
+    pa.concat_tables(tables).to_pandas()
+    table_time = time.perf_counter() - start
+
+    print(f"   Mémoire/échantillon : dicts {records_bytes / n_samples:,.0f} o | "
+          f"Arrow {table.nbytes / n_samples:,.0f} o | x{records_bytes / table.nbytes:.1f}")
+    print(f"   Pickle (IPC) : dicts {records_pickle / 1e6:.1f} Mo | Arrow {table_pickle / 1e6:.1f} Mo")
+    print(f"   Concaténation + DataFrame : dicts {records_time:.2f}s | Arrow {table_time:.2f}s")
+
+
+def main():
+    """Lance les tests de process_chunk puis le benchmark"""
+    print("🧪 TESTS DE process_chunk")
+    print("=" * 60)
+
+    test_sentiment_computed_once_per_document()
+    print("✅ Une seule analyse de sentiment par document")
+
+    test_shared_sentiment_values()
+    print("✅ Résultat de sentiment partagé")
+
+    test_pool_matches_sequential_and_merges_stats()
+    print("✅ Pool avec initializer identique au séquentiel")
+
+    test_worker_task_payload()
+    print("✅ Tâche des workers allégée")
+
+    test_lazy_chunk_loading()
+    print("✅ Chunks lus par plages d'index")
+
+    test_chunks_written_incrementally()
+    print("✅ Écriture Parquet incrémentale par chunk")
+
+    test_manifest_and_resume()
+    print("✅ Manifeste des chunks et reprise")
+
+    test_bounded_unordered_scheduling()
+    print("✅ Ordonnancement borné, résultats consommés au fil de l'eau")
+
+    test_adaptive_chunking()
+    print("✅ Découpage adaptatif par coût estimé")
+
+    test_columnar_chunk_results()
+    print("✅ Résultats de chunk en colonnes Arrow")
+
+    test_failing_document_skipped()
+    print("✅ Document fautif ignoré sans faire échouer le chunk")
+
+    print("\n⚡ BENCHMARK (20k échantillons)")
+    benchmark_columnar_results()
+
+
+if __name__ == "__main__":
+    main()
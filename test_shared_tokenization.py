@@ -0,0 +1,104 @@
+"""
+Tests de la tokenisation partagée entre preprocessing et features (analyze)
+"""
+
+import sys
+import time
+sys.path.append('src')
+
+import numpy as np
+from nltk.tokenize import word_tokenize
+
+from src.text_preprocessor import AdvancedTextPreprocessor
+from test_preprocess_batch import make_reviews
+
+TOKENIZE_TEXTS = [
+    "i cannot believe it",
+    "we are gonna wanna gimme more lemme see",
+    "gotta go d ye know t is mor n ol",
+    "Cannot GONNA Wanna",
+    "école naïve über straße 2024 42nd",
+    "tabs\tand\nnew   lines",
+    "   ",
+    "cannotcannot ingonna wannabe",
+    "this is amazing i can t believe it s so good",
+    "This is AMAZING!!! I can't believe it's so good.",
+    "Won't work properly. It's broken & doesn't do what it's supposed to do.",
+]
+
+
+def test_tokenize_fast_path_parity():
+    """Le chemin rapide (texte sans ponctuation) reproduit word_tokenize"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+
+    for text in TOKENIZE_TEXTS + make_reviews(30):
+        assert preprocessor.tokenize(text, method='nltk') == word_tokenize(text.lower()), text
+
+
+def test_analyze_parity():
+    """analyze = preprocess_text + extract_features"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+
+    for full_pipeline in (True, False):
+        for text in TOKENIZE_TEXTS + make_reviews(20) + ["", None]:
+            processed, features = preprocessor.analyze(text, full_pipeline=full_pipeline)
+            assert processed == preprocessor.preprocess_text(text, full_pipeline=full_pipeline)
+            assert features == preprocessor.extract_features(text if isinstance(text, str) else "")
+
+
+def test_analyze_batch_parity():
+    """analyze_batch = preprocess_batch + extract_features_batch"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    texts = make_reviews(20) + ["", "   "]
+
+    processed, features_df = preprocessor.analyze_batch(texts, feature_set='surface')
+
+    assert processed == preprocessor.preprocess_batch(texts)
+    expected_df = preprocessor.extract_features_batch(texts, feature_set='surface')
+    assert list(features_df.columns) == list(expected_df.columns)
+    for column in expected_df.columns:
+        np.testing.assert_allclose(features_df[column].to_numpy(dtype=float),
+                                   expected_df[column].to_numpy(dtype=float))
+
+
+def benchmark_analyze(n_reviews=5000):
+    """Compare preprocess_text + extract_features et analyze"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    texts = make_reviews(n_reviews)
+    preprocessor.analyze(texts[0])
+
+    start = time.perf_counter()
+    for text in texts:
+        preprocessor.preprocess_text(text)
+        preprocessor.extract_features(text)
+    separate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        preprocessor.analyze(text)
+    shared_time = time.perf_counter() - start
+
+    print(f"   Séparé : {separate_time:.2f}s | analyze : {shared_time:.2f}s | "
+          f"x{separate_time / shared_time:.2f}")
+
+
+def main():
+    """Lance les tests puis le benchmark"""
+    print("🧪 TESTS DE LA TOKENISATION PARTAGÉE")
+    print("=" * 60)
+
+    test_tokenize_fast_path_parity()
+    print("✅ Chemin rapide identique à word_tokenize")
+
+    test_analyze_parity()
+    print("✅ analyze identique à preprocess_text + extract_features")
+
+    test_analyze_batch_parity()
+    print("✅ analyze_batch identique aux API batch")
+
+    print("\n⚡ BENCHMARK")
+    benchmark_analyze()
+
+
+if __name__ == "__main__":
+    main()
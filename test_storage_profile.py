@@ -0,0 +1,170 @@
+"""
+Tests et benchmark du profil de stockage compact (colonnes dérivables non écrites)
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+sys.path.append('src')
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.massive_preprocessing_pipeline import (
+    MassivePreprocessingPipeline, DERIVED_COLUMNS, PROCESSED_COLUMNS, load_processed_data
+)
+from test_process_chunk import make_chunk
+
+
+def make_pipeline(output_dir, storage_profile, chunk_size=8):
+    """Pipeline séquentiel avec le profil de stockage demandé"""
+    return MassivePreprocessingPipeline(output_dir=output_dir, use_multiprocessing=False,
+                                        chunk_size=chunk_size, storage_profile=storage_profile)
+
+
+def raises_value_error(function, *args, **kwargs):
+    """Vrai si l'appel lève une ValueError"""
+    try:
+        function(*args, **kwargs)
+    except ValueError:
+        return True
+    return False
+
+
+def test_compact_chunks_rebuilt_on_read():
+    """Les fichiers par chunk n'ont plus les colonnes dérivables, relues à l'identique"""
+    samples = make_chunk(30)
+    with tempfile.TemporaryDirectory() as full_dir, tempfile.TemporaryDirectory() as compact_dir:
+        expected_df = make_pipeline(full_dir, 'full').process_dataset_split(samples, 'test')
+        assert list(expected_df.columns) == PROCESSED_COLUMNS
+
+        compact = make_pipeline(compact_dir, 'compact')
+        df = compact.process_dataset_split(samples, 'test')
+        stored = pq.read_schema(Path(compact_dir) / "split=test" / "part-00000.parquet").names
+        assert not set(DERIVED_COLUMNS) & set(stored)
+        assert df.equals(expected_df)
+
+        # Colonnes choisies : seules leurs sources sont lues
+        subset = load_processed_data(Path(compact_dir) / "split=test", columns=['label', 'text_length'])
+        assert list(subset.columns) == ['label', 'text_length']
+        assert subset.equals(expected_df[['label', 'text_length']])
+
+        # Vue paresseuse : résumé calculé avec les colonnes reconstruites
+        compact.save_processed_data(compact.load_processed_split('test', lazy=True),
+                                    compact.load_processed_split('test', lazy=True))
+        assert not (Path(compact_dir) / "test_processed.csv").exists()
+
+        assert raises_value_error(load_processed_data, Path(compact_dir) / "split=test", columns=['missing'])
+        assert raises_value_error(MassivePreprocessingPipeline, output_dir=compact_dir, storage_profile='tiny')
+
+
+def test_compact_exports_and_loader():
+    """Parquet, CSV et pickle compacts, reconstruits par load_processed_data"""
+    samples = make_chunk(30)
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = make_pipeline(output_dir, 'compact')
+        df = pipeline.process_dataset_split(samples, 'test')
+        pipeline.save_processed_data(df, df)
+
+        for filename in ("train_processed.parquet", "train_processed.pkl"):
+            assert load_processed_data(Path(output_dir) / filename).equals(df)
+
+        csv_df = load_processed_data(Path(output_dir) / "train_processed.csv")
+        assert list(csv_df.columns) == PROCESSED_COLUMNS
+        for column in DERIVED_COLUMNS:
+            assert csv_df[column].tolist() == df[column].tolist()
+        assert 'combined_text' not in pd.read_csv(Path(output_dir) / "train_processed.csv", nrows=1).columns
+
+
+def test_compact_csv_keeps_na_like_texts():
+    """Titres ou contenus "NA", "None", "null" ou vides relus tels quels depuis un CSV compact"""
+    samples = [{'title': title, 'content': content, 'label': i % 2}
+               for i, (title, content) in enumerate([("NA", "Great product, works well."),
+                                                     ("None", "null"), ("", "NaN"),
+                                                     ("Title", "n/a")])]
+    samples += make_chunk(10)
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = make_pipeline(output_dir, 'compact')
+        df = pipeline.process_dataset_split(samples, 'test')
+        pipeline.save_processed_data(df, df)
+
+        csv_df = load_processed_data(Path(output_dir) / "train_processed.csv")
+        assert csv_df['title'].tolist()[:4] == ["NA", "None", "", "Title"]
+        assert csv_df['content'].tolist()[:4] == [sample['content'] for sample in samples[:4]]
+        for column in DERIVED_COLUMNS:
+            assert csv_df[column].tolist() == df[column].tolist()
+        assert csv_df['label'].tolist() == df['label'].tolist()
+
+
+def test_resume_requires_same_profile():
+    """Les chunks écrits avec un autre profil sont retraités à la reprise"""
+    samples = make_chunk(30)
+    with tempfile.TemporaryDirectory() as output_dir:
+        expected_df = make_pipeline(output_dir, 'full').process_dataset_split(samples, 'test')
+
+        compact = make_pipeline(output_dir, 'compact')
+        before = compact.preprocessor.sentiment_evaluations
+        assert compact.process_dataset_split(samples, 'test', resume=True).equals(expected_df)
+        assert compact.preprocessor.sentiment_evaluations - before == len(samples)
+        entries = compact.load_manifest()['chunks'].values()
+        assert {entry['storage_profile'] for entry in entries} == {'compact'}
+
+
+def file_sizes(output_dir):
+    """Taille (Mo) des exports de save_processed_data"""
+    return {suffix: (Path(output_dir) / f"train_processed.{suffix}").stat().st_size / 1e6
+            for suffix in ('parquet', 'csv', 'pkl')}
+
+
+def benchmark_storage_profiles(n_samples=20000):
+    """Taille et temps d'écriture des exports, profil complet vs compact"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        df = make_pipeline(output_dir, 'full', chunk_size=n_samples).process_chunk(
+            make_chunk(n_samples), chunk_id=0)['table'].to_pandas()
+
+    results = {}
+    for profile in MassivePreprocessingPipeline.STORAGE_PROFILES:
+        with tempfile.TemporaryDirectory() as output_dir:
+            pipeline = make_pipeline(output_dir, profile)
+            start = time.perf_counter()
+            pipeline.save_processed_data(df, df.head(0))
+            results[profile] = (time.perf_counter() - start, file_sizes(output_dir))
+
+            start = time.perf_counter()
+            load_processed_data(Path(output_dir) / "train_processed.parquet")
+            read_time = time.perf_counter() - start
+
+        write_time, sizes = results[profile]
+        print(f"   {profile:8s}: Parquet {sizes['parquet']:.1f} Mo | CSV {sizes['csv']:.1f} Mo | "
+              f"pickle {sizes['pkl']:.1f} Mo | écriture {write_time:.2f}s | relecture Parquet {read_time:.2f}s")
+
+    full_size = sum(results['full'][1].values())
+    compact_size = sum(results['compact'][1].values())
+    print(f"   Gain compact : taille x{full_size / compact_size:.2f}, "
+          f"écriture x{results['full'][0] / results['compact'][0]:.2f}")
+
+
+def main():
+    """Lance les tests puis le benchmark"""
+    print("🧪 TESTS DU PROFIL DE STOCKAGE")
+    print("=" * 60)
+
+    test_compact_chunks_rebuilt_on_read()
+    print("✅ Colonnes dérivées reconstruites à la lecture")
+
+    test_compact_exports_and_loader()
+    print("✅ Exports compacts et load_processed_data")
+
+    test_compact_csv_keeps_na_like_texts()
+    print("✅ Textes \"NA\" conservés dans le CSV compact")
+
+    test_resume_requires_same_profile()
+    print("✅ Reprise liée au profil de stockage")
+
+    print("\n⚡ BENCHMARK (20k échantillons)")
+    benchmark_storage_profiles()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Tests des caches LRU de lemmatisation et de stemming
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import src.massive_preprocessing_pipeline as pipeline_module
+from src.massive_preprocessing_pipeline import MassivePreprocessingPipeline
+from src.text_preprocessor import AdvancedTextPreprocessor, TokenCache
+
+TOKENS = ["running", "dogs", "was", "better", "geese", "running", "dogs", "cats", "was"]
+
+
+def test_token_cache_lru_eviction():
+    """Le cache reste borné et évince l'entrée la moins récemment utilisée"""
+    cache = TokenCache(maxsize=2)
+
+    assert cache.map(["a", "b"], str.upper) == ["A", "B"]
+    assert cache.map(["a"], str.upper) == ["A"]  # "a" devient la plus récente
+    cache.map(["c"], str.upper)                  # évince "b"
+
+    assert [token for token, _ in cache.items()] == ["a", "c"]
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'hit_ratio': 0.25, 'size': 2, 'maxsize': 2}
+
+
+def test_token_cache_disabled():
+    """maxsize=0 désactive le cache sans changer les résultats"""
+    cache = TokenCache(maxsize=0)
+
+    assert cache.map(["a", "a"], str.upper) == ["A", "A"]
+    assert len(cache) == 0
+    assert cache.misses == 2
+
+
+def test_cached_lemmatize_and_stem_parity():
+    """Les caches ne changent pas la sortie de lemmatize et stem"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+
+    assert preprocessor.lemmatize(TOKENS) == [preprocessor.lemmatizer.lemmatize(t) for t in TOKENS]
+    assert preprocessor.stem(TOKENS) == [preprocessor.stemmer.stem(t) for t in TOKENS]
+
+    stats = preprocessor.cache_stats()
+    assert stats['lemma']['hits'] == 3
+    assert stats['lemma']['misses'] == 6
+    assert stats['stem']['size'] == 6
+
+
+def test_token_cache_persistence():
+    """Les caches sauvegardés préchauffent un nouveau preprocesseur"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    preprocessor.lemmatize(TOKENS)
+    preprocessor.stem(TOKENS)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "token_caches.pkl")
+        preprocessor.save_token_caches(cache_path)
+
+        warm = AdvancedTextPreprocessor(use_spacy=False, token_cache_path=cache_path)
+
+    assert warm.lemma_cache.items() == preprocessor.lemma_cache.items()
+    assert warm.lemmatize(TOKENS) == preprocessor.lemmatize(TOKENS)
+    assert warm.cache_stats()['lemma']['misses'] == 0
+
+
+def test_token_cache_reaches_pipeline_workers():
+    """token_cache_path suit le pipeline jusqu'au preprocesseur partagé des workers"""
+    preprocessor = AdvancedTextPreprocessor(use_spacy=False)
+    preprocessor.lemmatize(TOKENS)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "token_caches.pkl")
+        preprocessor.save_token_caches(cache_path)
+
+        # Registre (celui du module importé par le pipeline) : une instance par fichier de caches
+        get_shared_preprocessor = pipeline_module.get_shared_preprocessor
+        warm = get_shared_preprocessor(token_cache_path=cache_path)
+        assert get_shared_preprocessor(token_cache_path=cache_path) is warm
+        assert get_shared_preprocessor() is not warm
+        assert warm.lemma_cache.items() == preprocessor.lemma_cache.items()
+
+        pipeline = MassivePreprocessingPipeline(output_dir=tmp_dir, use_multiprocessing=False,
+                                                token_cache_path=cache_path)
+        assert pipeline.preprocessor is warm
+        assert pipeline.worker_config()['token_cache_path'] == cache_path
+
+        # Initializer du pool : le pipeline du worker utilise les caches préchargés
+        pipeline_module._init_worker(pipeline.worker_config())
+        assert pipeline_module._worker_pipeline.preprocessor.lemma_cache.items() == preprocessor.lemma_cache.items()
+
+
+def main():
+    """Lance les tests des caches de tokens"""
+    print("🧪 TESTS DES CACHES DE TOKENS")
+    print("=" * 60)
+
+    test_token_cache_lru_eviction()
+    print("✅ Éviction LRU")
+
+    test_token_cache_disabled()
+    print("✅ Cache désactivable")
+
+    test_cached_lemmatize_and_stem_parity()
+    print("✅ Parité lemmatize/stem")
+
+    test_token_cache_persistence()
+    print("✅ Persistance sur disque")
+
+    test_token_cache_reaches_pipeline_workers()
+    print("✅ Caches préchargés dans les workers du pipeline")
+
+
+if __name__ == "__main__":
+    main()